@@ -0,0 +1,19 @@
+"""Analytics package."""
+from analytics.facets import FacetIndex, get_facets
+from analytics.stats import JobsStats, compute_stats, get_stats
+from analytics.transitions import StageAggregator, StageMetrics, get_stage_aggregator, get_stage_metrics
+from analytics.weekly import compute_weekly, get_weekly_data
+
+__all__ = [
+    'FacetIndex',
+    'get_facets',
+    'JobsStats',
+    'compute_stats',
+    'get_stats',
+    'StageAggregator',
+    'StageMetrics',
+    'get_stage_aggregator',
+    'get_stage_metrics',
+    'compute_weekly',
+    'get_weekly_data'
+]
@@ -0,0 +1,154 @@
+"""
+Filtres à facettes.
+===================
+Index précalculés une fois par version de données : pour chaque facette,
+les positions de lignes (triées) de chaque valeur. Un filtre combiné est
+l'intersection des positions retenues par chaque facette, et les compteurs
+d'une facette sont un bincount sur les lignes retenues par les autres.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import COLUMNS
+from database.sync import frame_key
+
+# Facettes catégorielles : nom -> colonne
+CATEGORY_FACETS = {
+    "statut": COLUMNS["statut"],
+    "job_board": COLUMNS["job_board"],
+    "location": COLUMNS["location"],
+}
+
+SCORE_RANGE = (0, 10)
+
+# Sélection : {"statut": [...], "job_board": [...], "location": [...],
+#              "score": (min, max), "date": (début, fin)} ; clé absente ou vide = pas de filtre
+FacetSelection = dict
+
+
+class FacetIndex:
+    """Positions de lignes par valeur de facette pour un DataFrame figé."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        self.labels: dict[str, list] = {}
+        self._codes: dict[str, np.ndarray] = {}
+        self._positions: dict[str, dict] = {}
+
+        for name, col in CATEGORY_FACETS.items():
+            values = df[col] if col in df.columns else pd.Series("", index=df.index)
+            values = values.astype("category")
+            self.labels[name] = list(values.cat.categories)
+            self._codes[name] = values.cat.codes.to_numpy()
+            self._positions[name] = values.groupby(values, observed=True).indices
+
+        score = df[COLUMNS["score"]] if COLUMNS["score"] in df.columns else pd.Series(0, index=df.index)
+        self._score = score.to_numpy(dtype=np.int64)
+        self._positions["score"] = score.groupby(score).indices
+
+        # Dates triées (NaT en fin) : une plage de dates est une tranche de l'ordre
+        dates = df.get(COLUMNS["date_scraping"], pd.Series(pd.NaT, index=df.index))
+        dates = pd.to_datetime(dates).dt.normalize().to_numpy(dtype="datetime64[D]")
+        self._date_order = np.argsort(dates, kind="stable")
+        self._sorted_dates = dates[self._date_order]
+        self._n_dated = int((~np.isnat(dates)).sum())
+
+    # === Bornes des facettes ===
+
+    def options(self, facet: str) -> list:
+        """Valeurs présentes d'une facette catégorielle, les plus fréquentes d'abord."""
+        positions = self._positions[facet]
+        return sorted(positions, key=lambda value: -len(positions[value]))
+
+    @property
+    def date_bounds(self) -> tuple[date, date] | None:
+        """Première et dernière date de scraping (None si aucune date)."""
+        if not self._n_dated:
+            return None
+        first, last = self._sorted_dates[0], self._sorted_dates[self._n_dated - 1]
+        return first.astype(date), last.astype(date)
+
+    # === Filtrage ===
+
+    def select(self, selection: FacetSelection, within: np.ndarray | None = None,
+               exclude: str | None = None) -> np.ndarray | None:
+        """
+        Positions des lignes retenues par toutes les facettes actives.
+
+        Args:
+            selection: Valeurs retenues par facette
+            within: Positions triées auxquelles se restreindre (ex. recherche)
+            exclude: Facette ignorée (calcul de ses propres compteurs)
+
+        Returns:
+            Positions triées, ou None si aucun filtre n'est actif
+        """
+        sets = [] if within is None else [within]
+        for facet, value in selection.items():
+            if facet != exclude:
+                positions = self._facet_positions(facet, value)
+                if positions is not None:
+                    sets.append(positions)
+        if not sets:
+            return None
+
+        sets.sort(key=len)
+        rows = sets[0]
+        for other in sets[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def counts(self, facet: str, selection: FacetSelection,
+               within: np.ndarray | None = None) -> dict:
+        """Nombre de lignes par valeur de `facet` compte tenu des autres facettes."""
+        rows = self.select(selection, within=within, exclude=facet)
+        if facet == "score":
+            codes, labels = self._score, range(SCORE_RANGE[0], SCORE_RANGE[1] + 1)
+        else:
+            codes, labels = self._codes[facet], self.labels[facet]
+        if rows is not None:
+            codes = codes[rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        return dict(zip(labels, counts.tolist()))
+
+    def _facet_positions(self, facet: str, value) -> np.ndarray | None:
+        """Positions triées retenues par une facette (None = facette inactive)."""
+        if facet == "date":
+            return self._date_positions(value)
+        if facet == "score":
+            low, high = value
+            if (low, high) == SCORE_RANGE:
+                return None
+            value = range(low, high + 1)
+        if not value:
+            return None
+
+        positions = self._positions[facet]
+        parts = [positions[v] for v in value if v in positions]
+        if len(parts) == 1:
+            return parts[0]
+        # Valeurs disjointes : union = concaténation triée
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+
+    def _date_positions(self, value) -> np.ndarray | None:
+        if not value or len(value) != 2:
+            return None
+        start, end = (np.datetime64(day, "D") for day in value)
+        dated = self._sorted_dates[:self._n_dated]
+        lo = np.searchsorted(dated, start, side="left")
+        hi = np.searchsorted(dated, end, side="right")
+        if lo == 0 and hi == self._n_dated == self.size:
+            return None
+        return np.sort(self._date_order[lo:hi])
+
+
+@st.cache_resource(max_entries=4, show_spinner=False, hash_funcs={pd.DataFrame: frame_key})
+def get_facets(df: pd.DataFrame) -> FacetIndex:
+    """FacetIndex partagé par version de données (lecture seule)."""
+    return FacetIndex(df)
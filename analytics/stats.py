@@ -0,0 +1,90 @@
+"""
+Statistiques partagées du dataset.
+==================================
+Un seul crosstab statut × tranche de score, calculé une fois par version de
+données, fournit tous les compteurs affichés par la sidebar et les pages.
+"""
+
+from dataclasses import dataclass, field
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import COLUMNS, PIPELINE_ORDER, SCORE_THRESHOLDS
+from database.sync import frame_key
+
+SCORE_BUCKETS = ["low", "medium", "high"]
+
+
+@dataclass(frozen=True)
+class JobsStats:
+    """Instantané des compteurs du dataset."""
+    total: int = 0
+    by_status: dict[str, int] = field(default_factory=dict)
+    by_bucket: dict[str, int] = field(default_factory=dict)
+    status_buckets: dict[str, dict[str, int]] = field(default_factory=dict)
+    avg_score: float = 0.0
+    avg_score_by_status: dict[str, float] = field(default_factory=dict)
+
+    def count(self, status: str) -> int:
+        """Nombre de jobs dans un statut."""
+        return self.by_status.get(status, 0)
+
+    def count_in(self, status: str, bucket: str) -> int:
+        """Nombre de jobs d'un statut dans une tranche de score."""
+        return self.status_buckets.get(status, {}).get(bucket, 0)
+
+    @property
+    def high_score(self) -> int:
+        """Jobs avec score >= SCORE_THRESHOLDS["high"]."""
+        return self.by_bucket.get("high", 0)
+
+    @property
+    def in_progress(self) -> int:
+        """Jobs ni postulés ni refusés."""
+        return self.total - self.count("Postulé") - self.count("Refus")
+
+    @property
+    def conversion(self) -> float:
+        """Part des jobs postulés, en %."""
+        return self.count("Postulé") / self.total * 100 if self.total else 0.0
+
+
+def compute_stats(df: pd.DataFrame) -> JobsStats:
+    """Calcule l'instantané de statistiques (crosstab statut × tranche de score)."""
+    if df.empty:
+        return JobsStats(by_status=dict.fromkeys(PIPELINE_ORDER, 0))
+
+    score = df[COLUMNS["score"]]
+    buckets = pd.cut(
+        score,
+        bins=[float("-inf"), SCORE_THRESHOLDS["medium"], SCORE_THRESHOLDS["high"], float("inf")],
+        labels=SCORE_BUCKETS,
+        right=False,
+    )
+    # Crosstab statut × tranche (groupby.size sur catégories : ~5x plus rapide que pd.crosstab)
+    crosstab = df.groupby([df[COLUMNS["statut"]], buckets], observed=False).size().unstack()
+    crosstab = crosstab.reindex(
+        index=list(dict.fromkeys(PIPELINE_ORDER + list(crosstab.index))),
+        columns=SCORE_BUCKETS,
+        fill_value=0,
+    )
+    avg_by_status = score.groupby(df[COLUMNS["statut"]], observed=True).mean()
+
+    return JobsStats(
+        total=len(df),
+        by_status={status: int(n) for status, n in crosstab.sum(axis=1).items()},
+        by_bucket={bucket: int(n) for bucket, n in crosstab.sum(axis=0).items()},
+        status_buckets={
+            status: {bucket: int(n) for bucket, n in row.items()}
+            for status, row in crosstab.iterrows()
+        },
+        avg_score=float(score.mean()),
+        avg_score_by_status={status: float(avg) for status, avg in avg_by_status.items()},
+    )
+
+
+@st.cache_data(max_entries=8, show_spinner=False, hash_funcs={pd.DataFrame: frame_key})
+def get_stats(df: pd.DataFrame) -> JobsStats:
+    """compute_stats mis en cache par version de données."""
+    return compute_stats(df)
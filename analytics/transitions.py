@@ -0,0 +1,141 @@
+"""
+Temps par étape.
+================
+Agrégats de durée de séjour et de débit par statut, tenus à jour à partir
+du journal des transitions (database/transitions.py) : chaque passage ne
+lit que les lignes ajoutées depuis le précédent, jamais tout le journal.
+"""
+
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+import streamlit as st
+
+from config.settings import PIPELINE_ORDER, TRANSITIONS_CONFIG
+from database.transitions import TransitionLog
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    """Instantané des métriques d'une étape."""
+    stays: int = 0                  # Séjours terminés dont l'entrée est journalisée
+    avg_dwell: float | None = None  # Durée moyenne de ces séjours (secondes)
+    entries: int = 0
+    exits: int = 0
+    throughput: int = 0             # Sorties sur la fenêtre récente
+    open: int = 0                   # Séjours en cours dont l'entrée est journalisée
+    open_age: float | None = None   # Ancienneté moyenne des séjours en cours (secondes)
+
+
+class StageAggregator:
+    """
+    Agrégats incrémentaux par étape.
+
+    La durée d'un séjour n'est connue que si l'entrée dans l'étape a été
+    journalisée : la première transition observée d'un record ouvre son
+    suivi sans compter de séjour.
+    """
+
+    def __init__(self, log: TransitionLog):
+        self.log = log
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.events = 0
+        self._last_stamp: str | None = None
+        self._last_at: datetime | None = None
+        self._entered: dict[str, tuple[str, float]] = {}   # record -> (étape, entrée en s epoch)
+        self._dwell_sum: defaultdict[str, float] = defaultdict(float)
+        self._stays: Counter = Counter()
+        self._entries: Counter = Counter()
+        self._exits: Counter = Counter()
+        self._daily_exits: defaultdict[date, Counter] = defaultdict(Counter)
+        self._open: Counter = Counter()
+        self._open_since: defaultdict[str, float] = defaultdict(float)  # Somme des entrées en cours
+
+    def refresh(self) -> int:
+        """Intègre les transitions ajoutées depuis le dernier passage ; retourne leur nombre."""
+        with self._lock:
+            events, offset = self.log.read_from(self.offset)
+            if offset < 0:
+                # Journal remplacé ou tronqué : on repart de zéro
+                self._reset()
+                events, offset = self.log.read_from(0)
+            for event in events:
+                self._add(event)
+            self.offset = max(offset, 0)
+            self.events += len(events)
+            return len(events)
+
+    def _add(self, event: dict) -> None:
+        record_id, frm, to = event["id"], event["from"], event["to"]
+        # Les transitions d'un même lot partagent leur horodatage
+        if event["at"] != self._last_stamp:
+            self._last_stamp = event["at"]
+            self._last_at = datetime.fromisoformat(event["at"])
+        at = self._last_at
+        ts = at.timestamp()
+
+        entered = self._entered.get(record_id)
+        if entered is not None:
+            stage, since = entered
+            self._open[stage] -= 1
+            self._open_since[stage] -= since
+            if stage == frm:
+                self._dwell_sum[frm] += max(ts - since, 0.0)
+                self._stays[frm] += 1
+
+        self._exits[frm] += 1
+        self._daily_exits[datetime.fromtimestamp(ts, timezone.utc).date()][frm] += 1
+        self._entries[to] += 1
+        self._entered[record_id] = (to, ts)
+        self._open[to] += 1
+        self._open_since[to] += ts
+
+    def snapshot(self, days: int = TRANSITIONS_CONFIG["throughput_days"],
+                 now: datetime | None = None) -> dict[str, StageMetrics]:
+        """
+        Métriques par étape (ordre du pipeline, puis étapes hors pipeline).
+
+        Args:
+            days: Fenêtre du débit, en jours (aujourd'hui inclus)
+            now: Instant de référence (maintenant par défaut)
+        """
+        now = now or datetime.now(timezone.utc)
+        first_day = now.astimezone(timezone.utc).date() - timedelta(days=days - 1)
+        with self._lock:
+            recent = Counter()
+            for day, exits in self._daily_exits.items():
+                if day >= first_day:
+                    recent.update(exits)
+            stages = list(dict.fromkeys(PIPELINE_ORDER + sorted(self._entries.keys() | self._exits.keys())))
+            return {
+                stage: StageMetrics(
+                    stays=self._stays[stage],
+                    avg_dwell=self._dwell_sum[stage] / self._stays[stage] if self._stays[stage] else None,
+                    entries=self._entries[stage],
+                    exits=self._exits[stage],
+                    throughput=recent[stage],
+                    open=self._open[stage],
+                    open_age=(now.timestamp() - self._open_since[stage] / self._open[stage])
+                    if self._open[stage] else None,
+                )
+                for stage in stages
+            }
+
+
+@st.cache_resource(show_spinner=False, hash_funcs={TransitionLog: lambda log: str(log.path)})
+def get_stage_aggregator(log: TransitionLog) -> StageAggregator:
+    """StageAggregator partagé par journal (un seul par process)."""
+    return StageAggregator(log)
+
+
+def get_stage_metrics(log: TransitionLog) -> dict[str, StageMetrics]:
+    """Métriques par étape, après intégration des nouvelles transitions du journal."""
+    aggregator = get_stage_aggregator(log)
+    aggregator.refresh()
+    return aggregator.snapshot()
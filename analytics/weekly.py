@@ -0,0 +1,71 @@
+"""
+Agrégation hebdomadaire des jobs.
+=================================
+Un seul groupby par semaine ISO (lundi → dimanche) sur Date Scraping, calculé
+une fois par version de données et partagé par tous les graphiques.
+"""
+
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import COLUMNS
+from database.sync import frame_key
+
+MONTHS_FR = {
+    1: "Jan", 2: "Fév", 3: "Mar", 4: "Avr", 5: "Mai", 6: "Juin",
+    7: "Juil", 8: "Août", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Déc",
+}
+
+
+def week_label(week_start: pd.Timestamp) -> str:
+    """Libellé court d'une semaine : "23 Déc"."""
+    return f"{week_start.day} {MONTHS_FR[week_start.month]}"
+
+
+def compute_weekly(df: pd.DataFrame, weeks: int = 8, today: date | None = None) -> pd.DataFrame:
+    """
+    Agrège les jobs par semaine ISO sur les `weeks` dernières semaines.
+    
+    Returns:
+        DataFrame indexé par début de semaine, colonnes: week_label, count,
+        avg_score, applied_count (les semaines sans job sont à 0)
+    """
+    today = pd.Timestamp(today or date.today())
+    current_week = today - pd.Timedelta(days=today.weekday())
+    week_starts = pd.date_range(end=current_week, periods=weeks, freq="7D")
+    
+    if df.empty or COLUMNS["date_scraping"] not in df.columns:
+        grouped = pd.DataFrame(columns=["count", "avg_score", "applied_count"])
+    else:
+        dates = df[COLUMNS["date_scraping"]]
+        in_window = (dates >= week_starts[0]) & (dates < current_week + pd.Timedelta(days=7))
+        window = df[in_window]
+        window_dates = window[COLUMNS["date_scraping"]].dt.normalize()
+        by_week = pd.DataFrame({
+            "week": window_dates - pd.to_timedelta(window_dates.dt.weekday, unit="D"),
+            "score": window[COLUMNS["score"]],
+            "applied": window[COLUMNS["statut"]] == "Postulé",
+        }).groupby("week")
+        grouped = pd.DataFrame({
+            "count": by_week.size(),
+            "avg_score": by_week["score"].mean(),
+            "applied_count": by_week["applied"].sum(),
+        })
+    
+    weekly = grouped.reindex(week_starts).fillna(0)
+    weekly["count"] = weekly["count"].astype(int)
+    weekly["applied_count"] = weekly["applied_count"].astype(int)
+    weekly.insert(0, "week_label", [week_label(start) for start in week_starts])
+    return weekly
+
+
+def get_weekly_data(df: pd.DataFrame, weeks: int = 8) -> pd.DataFrame:
+    """compute_weekly mis en cache par (version de données, fenêtre, jour)."""
+    return _cached_weekly(df, weeks, date.today())
+
+
+@st.cache_data(max_entries=32, show_spinner=False, hash_funcs={pd.DataFrame: frame_key})
+def _cached_weekly(df: pd.DataFrame, weeks: int, today: date) -> pd.DataFrame:
+    return compute_weekly(df, weeks, today)
@@ -12,11 +12,8 @@ import streamlit as st
 from config.settings import APP_CONFIG
 from config.styles import inject_custom_css
 from database.airtable import get_airtable_connection, load_jobs_data
+from analytics.stats import get_stats
 from components.sidebar import render_sidebar
-from pages.dashboard import render_dashboard
-from pages.inbox import render_inbox
-from pages.job_details import render_job_details
-from pages.pipeline import render_pipeline
 
 
 def init_session_state() -> None:
@@ -60,7 +57,7 @@ def main():
     # Database connection
     table = get_airtable_connection()
     
-    # Load data
+    # Load data (servies immédiatement, bloquant seulement sans aucune donnée)
     with st.spinner('📊 Chargement des données...'):
         df = load_jobs_data(table)
     
@@ -70,27 +67,32 @@ def main():
         st.info("Vérifiez votre configuration dans `.streamlit/secrets.toml`")
         return
     
+    # Stats partagées (calculées une fois par version de données)
+    stats = get_stats(df)
+    
     # Render sidebar & get current page
-    render_sidebar(df)
+    render_sidebar(stats, table)
     
-    # Page routing
+    # Page routing (module de page importé à la première visite seulement)
     current_page = st.session_state.current_page
     
     match current_page:
-        case 'dashboard':
-            render_dashboard(df)
         case 'inbox':
-            render_inbox(df, table)
+            from pages.inbox import render_inbox
+            render_inbox(table)
         case 'details':
             if st.session_state.selected_job_id:
-                render_job_details(df, table, st.session_state.selected_job_id)
+                from pages.job_details import render_job_details
+                render_job_details(table, st.session_state.selected_job_id)
             else:
                 st.session_state.current_page = 'inbox'
                 st.rerun()
         case 'pipeline':
-            render_pipeline(df, table)
+            from pages.pipeline import render_pipeline
+            render_pipeline(table)
         case _:
-            render_dashboard(df)
+            from pages.dashboard import render_dashboard
+            render_dashboard(df, stats, table)
 
 
 if __name__ == "__main__":
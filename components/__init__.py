@@ -1,11 +1,21 @@
 """Components package."""
 from components.cards import render_kpi_card, render_job_card, render_kanban_card, get_score_class
 from components.sidebar import render_sidebar
+from components.actions import rerun_fragment, run_with_progress
+from components.pagination import paginate, render_pagination, reset_page
+from components.templates import render_html, score_badge
 
 __all__ = [
     'render_kpi_card',
     'render_job_card', 
     'render_kanban_card',
     'get_score_class',
-    'render_sidebar'
+    'render_sidebar',
+    'paginate',
+    'render_pagination',
+    'reset_page',
+    'rerun_fragment',
+    'run_with_progress',
+    'render_html',
+    'score_badge'
 ]
\ No newline at end of file
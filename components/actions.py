@@ -0,0 +1,36 @@
+"""
+Actions groupées.
+=================
+Écritures par lots avec barre de progression, et relance du fragment
+courant une fois les données patchées.
+"""
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from database.airtable import get_pending_writes
+
+
+def rerun_fragment() -> None:
+    """Relance le fragment courant (toute l'app s'il s'exécute dans un rendu complet)."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def run_with_progress(action, table, payload, label: str) -> bool:
+    """
+    Exécute une écriture groupée (update_jobs / delete_jobs) avec une barre
+    de progression mise à jour après chaque lot Airtable.
+    """
+    bar = st.progress(0.0, text=label)
+    
+    def progress(done: int, total: int) -> None:
+        bar.progress(done / total, text=f"{label} ({done}/{total} lots)")
+    
+    ok = action(table, payload, progress=progress)
+    bar.empty()
+    if not ok:
+        st.toast(f"❌ Échec de l'envoi : {get_pending_writes(table)[1]}")
+    return ok
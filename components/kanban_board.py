@@ -0,0 +1,216 @@
+"""
+Kanban glisser-déposer.
+=======================
+Composant st.components.v2 : les cartes se déplacent entre colonnes côté
+navigateur, sans rerun ni écriture. Les déplacements en attente ne sont
+envoyés à Python qu'au clic sur "Appliquer", en un seul trigger, pour
+être commités en un seul update_jobs.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import COLUMNS, STATUS_CONFIG
+from components.templates import score_style, truncate
+
+CSS = """
+.kb-toolbar { display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.75rem; font-family: Inter, sans-serif; }
+.kb-pending { flex: 1; color: #94a3b8; font-size: 0.85rem; }
+.kb-btn { background: #1e293b; color: #f8fafc; border: 1px solid #334155; border-radius: 8px; padding: 0.4rem 0.9rem; font-size: 0.85rem; cursor: pointer; }
+.kb-btn:disabled { opacity: 0.4; cursor: default; }
+.kb-apply:not(:disabled) { background: #a78bfa; border-color: #a78bfa; color: #0f172a; font-weight: 600; }
+.kb-board { display: grid; grid-template-columns: repeat(var(--kb-columns), minmax(0, 1fr)); gap: 1rem; font-family: Inter, sans-serif; }
+.kb-header { background: #1e293b; border: 1px solid #334155; border-radius: 10px; padding: 0.75rem; margin-bottom: 0.75rem; display: flex; align-items: center; justify-content: space-between; }
+.kb-title { color: #f8fafc; font-weight: 600; font-size: 0.9rem; }
+.kb-count { background: color-mix(in srgb, var(--accent) 13%, transparent); color: var(--accent); padding: 0.2rem 0.6rem; border-radius: 8px; font-size: 0.75rem; font-weight: 600; }
+.kb-list { min-height: 120px; max-height: 70vh; overflow-y: auto; border: 1px dashed transparent; border-radius: 8px; padding: 2px; }
+.kb-list.kb-over { border-color: #a78bfa; background: rgba(167, 139, 250, 0.06); }
+.kb-card { background: #1e293b; border: 1px solid #334155; border-radius: 8px; padding: 0.75rem; margin-bottom: 0.5rem; cursor: grab; }
+.kb-card.kb-moved { border-color: #a78bfa; }
+.kb-card.kb-dragging { opacity: 0.4; }
+.kb-card-top { display: flex; justify-content: space-between; align-items: center; gap: 0.5rem; margin-bottom: 0.5rem; }
+.kb-company { font-size: 0.75rem; font-weight: 600; color: #94a3b8; text-transform: uppercase; letter-spacing: 0.3px; }
+.kb-score { padding: 0.25rem 0.5rem; border-radius: 6px; font-size: 0.8rem; font-weight: 700; white-space: nowrap; }
+.kb-poste { font-size: 0.9rem; font-weight: 500; color: #f8fafc; line-height: 1.35; }
+.kb-location { font-size: 0.8rem; color: #64748b; margin-top: 0.2rem; }
+"""
+
+JS = """
+// Déplacements en attente par plateau (survivent à un nouveau rendu du composant)
+const pendingByBoard = new Map();
+
+function el(tag, className, text) {
+    const node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+}
+
+export default function ({ data, parentElement, setTriggerValue }) {
+    if (!data) return;
+    const moves = pendingByBoard.get(data.board) ?? {};
+    pendingByBoard.set(data.board, moves);
+
+    parentElement.querySelectorAll(".kb-root").forEach((node) => node.remove());
+    const root = el("div", "kb-root");
+    parentElement.appendChild(root);
+
+    function render() {
+        root.replaceChildren();
+        const toolbar = el("div", "kb-toolbar");
+        const pendingLabel = el("span", "kb-pending");
+        const reset = el("button", "kb-btn", "Annuler");
+        const apply = el("button", "kb-btn kb-apply", "Appliquer");
+        toolbar.append(pendingLabel, reset, apply);
+
+        const board = el("div", "kb-board");
+        board.style.setProperty("--kb-columns", data.columns.length);
+        root.append(toolbar, board);
+
+        const lists = {}, counters = {}, nodes = new Map();
+        for (const col of data.columns) {
+            const column = el("div", "kb-column");
+            const header = el("div", "kb-header");
+            header.style.setProperty("--accent", col.color);
+            const counter = el("span", "kb-count");
+            header.append(el("span", "kb-title", `${col.icon} ${col.status}`), counter);
+            const list = el("div", "kb-list");
+            list.dataset.status = col.status;
+            column.append(header, list);
+            board.append(column);
+            lists[col.status] = list;
+            counters[col.status] = counter;
+
+            list.addEventListener("dragover", (event) => {
+                event.preventDefault();
+                list.classList.add("kb-over");
+            });
+            list.addEventListener("dragleave", () => list.classList.remove("kb-over"));
+            list.addEventListener("drop", (event) => {
+                event.preventDefault();
+                list.classList.remove("kb-over");
+                const node = nodes.get(event.dataTransfer.getData("text/plain"));
+                if (!node) return;
+                insertByScore(list, node);
+                if (col.status === node.dataset.origin) delete moves[node.dataset.id];
+                else moves[node.dataset.id] = col.status;
+                refresh();
+            });
+        }
+
+        for (const card of data.cards) {
+            const node = el("div", "kb-card");
+            node.draggable = true;
+            node.dataset.id = card.id;
+            node.dataset.origin = card.status;
+            node.dataset.score = card.score;
+            const top = el("div", "kb-card-top");
+            const badge = el("span", "kb-score", `${card.score}/10`);
+            badge.style.background = card.bg;
+            badge.style.color = card.fg;
+            top.append(el("span", "kb-company", card.entreprise), badge);
+            node.append(top, el("div", "kb-poste", card.poste));
+            if (card.location) node.append(el("div", "kb-location", `📍 ${card.location}`));
+            node.addEventListener("dragstart", (event) => {
+                event.dataTransfer.setData("text/plain", card.id);
+                event.dataTransfer.effectAllowed = "move";
+                node.classList.add("kb-dragging");
+            });
+            node.addEventListener("dragend", () => node.classList.remove("kb-dragging"));
+            nodes.set(card.id, node);
+            (lists[moves[card.id]] ?? lists[card.status]).append(node);
+        }
+
+        function insertByScore(list, node) {
+            const score = Number(node.dataset.score);
+            const next = [...list.children].find((child) => child !== node && Number(child.dataset.score) < score);
+            list.insertBefore(node, next ?? null);
+        }
+
+        function refresh() {
+            const delta = {};
+            for (const [id, target] of Object.entries(moves)) {
+                const origin = nodes.get(id)?.dataset.origin;
+                if (origin === undefined) continue;
+                delta[origin] = (delta[origin] ?? 0) - 1;
+                delta[target] = (delta[target] ?? 0) + 1;
+            }
+            for (const col of data.columns) counters[col.status].textContent = col.count + (delta[col.status] ?? 0);
+            for (const node of nodes.values()) node.classList.toggle("kb-moved", node.dataset.id in moves);
+            const n = Object.keys(moves).length;
+            pendingLabel.textContent = n ? `${n} déplacement(s) en attente` : "Glissez les cartes d'une colonne à l'autre";
+            apply.disabled = reset.disabled = n === 0;
+        }
+
+        reset.addEventListener("click", () => {
+            for (const id of Object.keys(moves)) delete moves[id];
+            render();
+        });
+        apply.addEventListener("click", () => {
+            setTriggerValue("apply", { ...moves });
+            pendingByBoard.delete(data.board);
+            apply.disabled = reset.disabled = true;
+            pendingLabel.textContent = "Envoi…";
+        });
+        refresh();
+    }
+
+    render();
+    return () => root.remove();
+}
+"""
+
+_kanban_board = st.components.v2.component("kanban_board", css=CSS, js=JS)
+
+
+def board_cards(jobs: pd.DataFrame) -> list[dict]:
+    """Cartes du plateau (champs affichés, déjà tronqués)."""
+    cards = []
+    for job_id, status, entreprise, poste, location, score in zip(
+        jobs["id"], jobs[COLUMNS["statut"]], jobs[COLUMNS["entreprise"]],
+        jobs[COLUMNS["poste"]], jobs[COLUMNS["location"]], jobs[COLUMNS["score"]],
+    ):
+        bg, fg = score_style(score)
+        cards.append({
+            "id": job_id,
+            "status": str(status),
+            "entreprise": str(entreprise)[:22],
+            "poste": truncate(str(poste), 35),
+            "location": truncate(str(location), 28) if pd.notna(location) else "",
+            "score": int(score),
+            "bg": bg,
+            "fg": fg,
+        })
+    return cards
+
+
+def render_kanban_board(counts: dict[str, int], jobs: pd.DataFrame, key: str) -> dict[str, str] | None:
+    """
+    Affiche le plateau glisser-déposer.
+
+    Args:
+        counts: Nombre exact de jobs par colonne (ordre des colonnes)
+        jobs: Jobs affichés (les cartes non rendues ne sont pas déplaçables)
+        key: Clé du composant ; la changer repart d'un plateau sans déplacement
+
+    Returns:
+        {record_id: nouveau statut} au clic sur "Appliquer", None sinon
+    """
+    columns = [
+        {
+            "status": status,
+            "count": count,
+            "icon": STATUS_CONFIG.get(status, {}).get("icon", "📋"),
+            "color": STATUS_CONFIG.get(status, {}).get("color", "#6B7280"),
+        }
+        for status, count in counts.items()
+    ]
+    result = _kanban_board(
+        data={"board": key, "columns": columns, "cards": board_cards(jobs)},
+        key=key,
+        on_apply_change=lambda: None,
+    )
+    moves = result.get("apply")
+    if not moves:
+        return None
+    return {job_id: status for job_id, status in moves.items() if status in counts}
@@ -0,0 +1,52 @@
+"""
+Pagination des listes.
+======================
+Seule la page courante est rendue : le nombre de widgets envoyés au
+navigateur reste borné par la taille de page, quel que soit le volume.
+"""
+
+import streamlit as st
+
+
+def paginate(total: int, page: int, page_size: int) -> tuple[int, int, int]:
+    """
+    Borne la page demandée et calcule la tranche à afficher.
+
+    Returns:
+        (page, start, end) : page valide et indices [start, end) des lignes
+    """
+    n_pages = max(1, -(-total // page_size))
+    page = min(max(page, 0), n_pages - 1)
+    start = page * page_size
+    return page, start, min(start + page_size, total)
+
+
+def reset_page(key: str) -> None:
+    """Revient à la première page (à appeler quand le filtre change)."""
+    st.session_state[key] = 0
+
+
+def render_pagination(total: int, key: str, page_size: int) -> None:
+    """Boutons précédent / suivant et position courante (page stockée dans `key`)."""
+    n_pages = max(1, -(-total // page_size))
+    if n_pages == 1:
+        return
+
+    page = st.session_state.get(key, 0)
+
+    def _go(delta: int) -> None:
+        st.session_state[key] = page + delta
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("← Précédent", key=f"{key}_prev", disabled=page == 0,
+                  on_click=_go, args=(-1,), use_container_width=True)
+    with col_info:
+        st.markdown(f"""
+            <div style="text-align:center;color:#64748b;font-size:0.85rem;padding-top:0.5rem;">
+                Page <strong style="color:#f8fafc;">{page + 1}</strong> / {n_pages}
+            </div>
+        """, unsafe_allow_html=True)
+    with col_next:
+        st.button("Suivant →", key=f"{key}_next", disabled=page >= n_pages - 1,
+                  on_click=_go, args=(1,), use_container_width=True)
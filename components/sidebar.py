@@ -3,12 +3,55 @@ Sidebar Dark Theme Moderne.
 """
 
 import streamlit as st
-import pandas as pd
 
-from config.settings import COLUMNS, APP_CONFIG
+from config.settings import APP_CONFIG, SYNC_CONFIG
+from analytics.stats import JobsStats
+from database.airtable import get_pending_writes, flush_pending_writes, get_data_status
 
 
-def render_sidebar(df: pd.DataFrame) -> None:
+def format_age(seconds: float | None) -> str:
+    """Âge des données en français ("il y a 3 min")."""
+    if seconds is None:
+        return "jamais synchronisées"
+    if seconds < 10:
+        return "à jour"
+    if seconds < 60:
+        return f"il y a {seconds:.0f} s"
+    if seconds < 3600:
+        return f"il y a {seconds // 60:.0f} min"
+    return f"il y a {seconds // 3600:.0f} h"
+
+
+@st.fragment(run_every=SYNC_CONFIG["status_interval"])
+def render_sync_status(table) -> None:
+    """
+    Écritures en attente, dernier échec d'envoi et fraîcheur des données.
+
+    Fragment rafraîchi périodiquement : les écritures des pages ne relancent
+    que leur propre fragment, et la file s'envoie en arrière-plan.
+    """
+    pending, error = get_pending_writes(table)
+    if pending:
+        st.markdown(f"""
+            <div style="display: flex; justify-content: space-between; align-items: center; margin: 1.25rem 0 0.5rem 0;">
+                <span style="color: #94a3b8; font-size: 0.8rem;">⏳ En attente d'envoi</span>
+                <span style="color: #fb923c; font-size: 0.8rem; font-weight: 600;">{pending}</span>
+            </div>
+        """, unsafe_allow_html=True)
+        if st.button("🔄 Envoyer maintenant", use_container_width=True):
+            flush_pending_writes(table)
+            st.rerun()
+    if error:
+        st.caption(f"⚠️ Dernier envoi échoué : {error}")
+    
+    data_status = get_data_status(table)
+    refreshing = " · actualisation…" if data_status["refreshing"] else ""
+    st.caption(f"🕒 Données {format_age(data_status['age'])}{refreshing}")
+    if data_status["error"]:
+        st.caption("⚠️ Airtable injoignable, dernières données connues affichées")
+
+
+def render_sidebar(stats: JobsStats, table) -> None:
     """Sidebar dark theme avec navigation et stats."""
     
     with st.sidebar:
@@ -46,7 +89,7 @@ def render_sidebar(df: pd.DataFrame) -> None:
             st.session_state.current_page = "dashboard"
             st.rerun()
         
-        to_analyze = len(df[df[COLUMNS["statut"]] == "À Analyser"]) if not df.empty else 0
+        to_analyze = stats.count("À Analyser")
         inbox_label = f"📥  Inbox  •  {to_analyze}" if to_analyze > 0 else "📥  Inbox"
         
         if st.button(
@@ -75,10 +118,10 @@ def render_sidebar(df: pd.DataFrame) -> None:
             </p>
         """, unsafe_allow_html=True)
         
-        if not df.empty:
-            total = len(df)
-            high_score = len(df[df[COLUMNS["score"]] >= 8])
-            applied = len(df[df[COLUMNS["statut"]] == "Postulé"])
+        if stats.total:
+            total = stats.total
+            high_score = stats.high_score
+            applied = stats.count("Postulé")
             
             # Stats
             st.markdown(f"""
@@ -108,6 +151,9 @@ def render_sidebar(df: pd.DataFrame) -> None:
                 </div>
             """, unsafe_allow_html=True)
         
+        # Écritures en attente et fraîcheur des données
+        render_sync_status(table)
+        
         # Footer
         st.markdown("""
             <div style="position: fixed; bottom: 1rem; left: 0; right: 0; text-align: center; width: inherit;">
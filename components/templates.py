@@ -0,0 +1,139 @@
+"""
+Gabarits HTML des cartes.
+=========================
+Gabarits string.Template compilés une fois à l'import. Une rangée ou une
+liste de cartes en lecture seule est envoyée au navigateur en un seul
+élément (grille CSS) au lieu d'un st.columns + un st.markdown par carte ;
+seuls les boutons restent des widgets.
+
+Les gabarits tiennent sur une ligne : dans st.markdown, une ligne vide ou
+indentée au milieu d'un bloc HTML le ferait basculer en Markdown.
+"""
+
+import html
+from string import Template
+from typing import Iterable
+
+import streamlit as st
+
+from config.settings import SCORE_THRESHOLDS
+
+# === Gabarits ===
+
+# Grille de cartes (gap aligné sur celui de st.columns)
+GRID = Template(
+    '<div style="display:grid;grid-template-columns:repeat($columns,minmax(0,1fr));'
+    'gap:$gap;margin-bottom:$margin;">$cards</div>'
+)
+
+# Carte statistique : libellé au-dessus de la valeur (Inbox, mini-stats du Dashboard)
+STAT_CARD = Template(
+    '<div style="background:#1e293b;border:1px solid #334155;border-radius:$radius;'
+    'padding:$padding;text-align:center;">'
+    '<div style="font-size:$label_size;color:#64748b;margin-bottom:0.25rem;">$label</div>'
+    '<div style="font-size:$value_size;font-weight:700;color:$color;">$value</div></div>'
+)
+
+# Carte statistique avec icône : icône, valeur, libellé (Pipeline)
+ICON_STAT_CARD = Template(
+    '<div style="background:#1e293b;border:1px solid #334155;border-radius:10px;padding:1rem;text-align:center;">'
+    '<div style="font-size:1.5rem;">$icon</div>'
+    '<div style="font-size:1.5rem;font-weight:700;color:$color;">$value</div>'
+    '<div style="font-size:0.75rem;color:#64748b;">$label</div></div>'
+)
+
+# Carte KPI du Dashboard (icône dans une pastille colorée)
+KPI_CARD = Template(
+    '<div style="background:#1e293b;border-radius:12px;padding:1.25rem;border:1px solid #334155;text-align:center;">'
+    '<div style="width:42px;height:42px;border-radius:10px;display:flex;align-items:center;'
+    'justify-content:center;font-size:1.25rem;margin:0 auto 0.75rem auto;background:${color}20;">$icon</div>'
+    '<div style="font-size:1.75rem;font-weight:700;color:#f8fafc;">$value</div>'
+    '<div style="font-size:0.75rem;color:#64748b;margin-top:0.25rem;">$label</div></div>'
+)
+
+# Badge de score /10
+SCORE_BADGE = Template(
+    '<span style="background:$bg;color:$color;padding:$padding;border-radius:$radius;'
+    'font-size:$size;font-weight:700;white-space:nowrap;">$score/10</span>'
+)
+
+# Badge de statut
+STATUS_BADGE = Template(
+    '<span style="background:${color}20;color:$color;padding:0.2rem 0.5rem;border-radius:5px;'
+    'font-size:0.7rem;font-weight:600;">$icon $status</span>'
+)
+
+# Ligne secondaire (lieu, entreprise...) ; vide si pas de texte
+META_LINE = Template('<div style="font-size:0.8rem;color:$color;margin-top:0.2rem;">$text</div>')
+
+# Corps de carte job : titre + lignes secondaires, badge de score à droite
+JOB_CARD = Template(
+    '<div style="display:flex;justify-content:space-between;align-items:flex-start;gap:0.75rem;">'
+    '<div style="min-width:0;">'
+    '<div style="font-size:0.95rem;font-weight:600;color:#f8fafc;margin-bottom:0.2rem;">$title</div>'
+    '$lines</div>$badge</div>'
+)
+
+# Corps de carte Kanban : entreprise + badge, titre, lieu
+KANBAN_CARD = Template(
+    '<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:0.5rem;">'
+    '<span style="font-size:0.75rem;font-weight:600;color:#94a3b8;text-transform:uppercase;letter-spacing:0.3px;">$entreprise</span>'
+    '$badge</div>'
+    '<div style="font-size:0.9rem;font-weight:500;color:#f8fafc;line-height:1.35;margin-bottom:0.4rem;">$poste</div>'
+    '$location'
+)
+
+# Carte d'étape du Dashboard : étape, durée moyenne de séjour, lignes de débit
+STAGE_CARD = Template(
+    '<div style="background:#1e293b;border:1px solid #334155;border-top:3px solid $color;border-radius:10px;padding:0.9rem;">'
+    '<div style="font-size:0.8rem;font-weight:600;color:#94a3b8;">$icon $stage</div>'
+    '<div style="font-size:1.4rem;font-weight:700;color:#f8fafc;margin-top:0.35rem;">$dwell</div>'
+    '<div style="font-size:0.7rem;color:#64748b;margin-bottom:0.35rem;">séjour moyen ($stays)</div>'
+    '$lines</div>'
+)
+
+# === Rendu ===
+
+
+def score_style(score: float) -> tuple[str, str]:
+    """(fond, couleur) du badge de score, thème sombre."""
+    if score >= SCORE_THRESHOLDS["high"]:
+        return "rgba(74,222,128,0.15)", "#4ade80"
+    elif score >= SCORE_THRESHOLDS["medium"]:
+        return "rgba(251,146,60,0.15)", "#fb923c"
+    return "rgba(248,113,113,0.15)", "#f87171"
+
+
+def score_badge(score: float, size: str = "0.85rem", padding: str = "0.35rem 0.6rem",
+                radius: str = "8px") -> str:
+    """HTML du badge de score."""
+    bg, color = score_style(score)
+    return SCORE_BADGE.substitute(bg=bg, color=color, padding=padding, radius=radius,
+                                  size=size, score=f"{score:.0f}")
+
+
+def meta_line(text: str, color: str = "#64748b") -> str:
+    """Ligne secondaire échappée (chaîne vide si `text` est vide)."""
+    return META_LINE.substitute(color=color, text=html.escape(text)) if text else ""
+
+
+def truncate(text: str, length: int) -> str:
+    """Coupe `text` à `length` caractères avec points de suspension."""
+    return text[:length] + "..." if len(text) > length else text
+
+
+def render_html(cards: Iterable[str], columns: int | None = None, gap: str = "1rem",
+                margin: str = "0") -> None:
+    """
+    Affiche des fragments HTML en un seul élément.
+
+    Args:
+        cards: Fragments HTML (déjà échappés)
+        columns: Nombre de colonnes de la grille, None pour une simple suite
+        gap: Espacement entre cartes
+        margin: Marge sous la grille
+    """
+    body = "".join(cards)
+    if columns is not None:
+        body = GRID.substitute(columns=columns, gap=gap, margin=margin, cards=body)
+    st.markdown(body, unsafe_allow_html=True)
@@ -69,6 +69,19 @@ COLUMNS = {
     "contact_mail": "contact mail",
 }
 
+# Champs légers chargés pour les listes. Les autres (description, cover letter,
+# contact...) ne sont chargés qu'à l'ouverture de la page détail.
+LIST_FIELDS = [
+    COLUMNS["poste"],
+    COLUMNS["entreprise"],
+    COLUMNS["location"],
+    COLUMNS["score"],
+    COLUMNS["statut"],
+    COLUMNS["date_candidature"],
+    COLUMNS["date_scraping"],
+    COLUMNS["job_board"],
+]
+
 PIPELINE_ORDER = ["À Analyser", "Générer LM", "Prêt", "Postulé", "Refus"]
 
 SCORE_THRESHOLDS = {
@@ -76,4 +89,63 @@ SCORE_THRESHOLDS = {
     "medium": 5,
 }
 
-DEFAULT_STATUS = "À Analyser"
\ No newline at end of file
+DEFAULT_STATUS = "À Analyser"
+
+# Synchronisation Airtable (en secondes)
+SYNC_CONFIG = {
+    "delta_interval": 60,        # Delta sync (records modifiés uniquement)
+    "full_interval": 15 * 60,    # Réconciliation complète (détecte les suppressions)
+    "clock_margin": 5,           # Recouvrement du high-water mark (décalage d'horloge)
+    "status_interval": 5,        # Rafraîchissement de l'état d'envoi dans la sidebar
+}
+
+# Limitation de débit Airtable (5 requêtes/seconde par base)
+RATE_LIMIT_CONFIG = {
+    "requests_per_second": 5,
+    "burst": 5,
+    "max_retries": 5,
+    "backoff_base": 0.5,     # Secondes, doublé à chaque essai (avec jitter)
+    "backoff_max": 30,
+}
+
+# File d'écritures différées vers Airtable
+WRITE_QUEUE_CONFIG = {
+    "batch_size": 10,          # Maximum de records par requête batch Airtable
+    "idle_delay": 3.0,         # Flush après N secondes sans nouvelle écriture
+    "retry_max_delay": 300.0,  # Plafond du backoff (doublé à chaque échec réessayable)
+}
+
+# Cache LRU des champs lourds (page détail)
+DETAILS_CONFIG = {
+    "cache_size": 128,    # Nombre de records gardés en mémoire
+}
+
+# Recherche plein texte (database/search.py)
+SEARCH_CONFIG = {
+    "min_prefix": 2,                   # Longueur minimale du dernier terme cherché en préfixe
+    "description_interval": 15 * 60,   # Réindexation des descriptions modifiées (secondes)
+    "compact_min_dead": 5000,          # Documents morts avant compactage de l'index
+}
+
+# Inbox paginée
+INBOX_CONFIG = {
+    "page_size": 20,                        # Jobs par page par défaut
+    "page_size_options": [10, 20, 50, 100],
+}
+
+# Kanban : seules les meilleures cartes de chaque colonne sont rendues
+PIPELINE_CONFIG = {
+    "column_size": 10,                      # Cartes par colonne au départ
+    "show_more_step": 10,                   # Cartes ajoutées par "Afficher plus"
+}
+
+# Miroir local SQLite, un fichier par (base, table) - relatif à la racine du projet
+MIRROR_CONFIG = {
+    "path": ".cache/jobs_{dataset}.sqlite3",
+}
+
+# Journal des changements de statut (JSON Lines, ajout seul) - relatif à la racine du projet
+TRANSITIONS_CONFIG = {
+    "path": ".cache/transitions_{dataset}.jsonl",
+    "throughput_days": 7,                   # Fenêtre du débit (sorties d'étape) sur le Dashboard
+}
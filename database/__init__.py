@@ -1,4 +1,14 @@
 """Database package."""
-from database.airtable import get_airtable_connection, load_jobs_data, update_job, delete_job
+from database.airtable import (
+    get_airtable_connection, load_jobs_data, update_job, delete_job, get_data_version,
+    enqueue_job_update, enqueue_job_delete, flush_pending_writes, get_pending_writes,
+    get_client_stats, load_job_details, get_job, get_data_status, update_jobs, delete_jobs,
+    search_jobs, get_transition_log,
+)
 
-__all__ = ['get_airtable_connection', 'load_jobs_data', 'update_job', 'delete_job']
\ No newline at end of file
+__all__ = [
+    'get_airtable_connection', 'load_jobs_data', 'update_job', 'delete_job', 'get_data_version',
+    'enqueue_job_update', 'enqueue_job_delete', 'flush_pending_writes', 'get_pending_writes',
+    'get_client_stats', 'load_job_details', 'get_job', 'get_data_status', 'update_jobs', 'delete_jobs',
+    'search_jobs', 'get_transition_log',
+]
\ No newline at end of file
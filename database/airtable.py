@@ -2,21 +2,32 @@
 Module Airtable avec Date Scraping.
 """
 
+import atexit
+import re
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
-from pyairtable import Api
+import requests
+
+from config.settings import MIRROR_CONFIG, TRANSITIONS_CONFIG
+from database.client import ThrottledApi, CLIENT_STATS
+from database.mirror import JobsMirror
+from database.sync import JobsSync, records_to_frame
+from database.transitions import TransitionLog
+from database.write_queue import WriteQueue, ProgressCallback
 
-from config.settings import COLUMNS
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 
 @st.cache_resource
 def get_airtable_connection():
-    """Connexion à Airtable."""
+    """Connexion à Airtable (débit limité, retries sur 429/5xx)."""
     try:
         API_KEY = st.secrets["airtable"]["api_key"]
         BASE_ID = st.secrets["airtable"]["base_id"]
         TABLE_NAME = st.secrets["airtable"]["table_name"]
-        api = Api(API_KEY)
+        api = ThrottledApi(API_KEY)
         return api.table(BASE_ID, TABLE_NAME)
     except (FileNotFoundError, KeyError):
         st.error("⚠️ Configuration Airtable manquante!")
@@ -27,49 +38,204 @@ table_name = "Jobs"''', language="toml")
         st.stop()
 
 
-@st.cache_data(ttl=60)
-def load_jobs_data(_table) -> pd.DataFrame:
-    """Charge les données depuis Airtable."""
-    records = _table.all()
+def get_jobs_sync(table) -> JobsSync:
+    """
+    Moteur de synchronisation du dataset de `table`.
+    
+    Un seul moteur par (base_id, table_name) pour tout le process : toutes
+    les sessions partagent le même DataFrame, la même file d'écritures et
+    un seul fetch Airtable à la fois.
+    """
+    return _get_dataset(table.base.id, table.name)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_dataset(base_id: str, table_name: str) -> JobsSync:
+    """Registre process-wide des datasets, indexé par (base_id, table_name)."""
+    slug = re.sub(r"\W+", "_", f"{base_id}_{table_name}")
+    mirror = JobsMirror(PROJECT_ROOT / MIRROR_CONFIG["path"].format(dataset=slug))
+    transitions = TransitionLog(PROJECT_ROOT / TRANSITIONS_CONFIG["path"].format(dataset=slug))
+    queue = WriteQueue()
+    atexit.register(queue.flush)
+    return JobsSync(mirror=mirror, queue=queue, transitions=transitions)
+
+
+def load_jobs_data(table) -> pd.DataFrame:
+    """
+    Charge les données depuis Airtable.
+    
+    Les données en mémoire (ou le miroir local au démarrage) sont servies
+    immédiatement, même périmées, et rafraîchies en arrière-plan. Seuls
+    les records modifiés depuis la dernière synchronisation sont
+    récupérés ; une réconciliation complète a lieu périodiquement. Seuls
+    les champs LIST_FIELDS sont chargés : voir load_job_details pour les
+    autres.
+    """
+    return get_jobs_sync(table).get_data(table)
+
+
+def get_job(table, record_id: str) -> pd.Series | None:
+    """
+    Récupère un job par id.
+    
+    Lecture O(1) dans le dataset chargé ; si le job n'y est pas (liste pas
+    encore chargée, record créé depuis), repli sur table.get.
+    
+    Returns:
+        pd.Series des champs de liste, ou None si le job n'existe pas
+    """
+    sync = get_jobs_sync(table)
+    job = sync.lookup(record_id)
+    if job is not None:
+        return job
+    
+    record = _fetch_record(table, record_id)
+    if record is None:
+        return None
+    sync.put_details(record)
+    return records_to_frame([record]).iloc[0]
+
+
+def load_job_details(table, record_id: str) -> dict | None:
+    """
+    Champs lourds d'un job (description, cover letter, contact...).
+    
+    Chargés à la demande via table.get puis gardés dans un cache LRU
+    (DETAILS_CONFIG), tenu à jour par les écritures.
+    
+    Returns:
+        dict des champs, ou None si le job a été supprimé dans Airtable
+        (il est alors retiré du dataset sans attendre la réconciliation)
+    """
+    sync = get_jobs_sync(table)
+    fields = sync.details.get(record_id)
+    if fields is not None:
+        return fields
+    
+    record = _fetch_record(table, record_id)
+    if record is None:
+        sync.apply_deletes([record_id])
+        return None
+    return sync.put_details(record)
+
+
+def _fetch_record(table, record_id: str) -> dict | None:
+    """Record complet via table.get, ou None s'il n'existe pas (404)."""
+    try:
+        return table.get(record_id)
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise
+
+
+def search_jobs(table, query: str) -> list[str] | None:
+    """
+    Recherche plein texte (Poste, Entreprise, Location, Description).
+    
+    Insensible aux accents et à la casse ; tous les termes doivent être
+    présents, le dernier pouvant être un début de mot.
+    
+    Returns:
+        Liste des ids correspondants, ou None si la requête est vide
+    """
+    return get_jobs_sync(table).search(table, query)
+
+
+def get_client_stats() -> dict:
+    """Compteurs d'appels Airtable : requests, throttled, retried, failed, throttle_wait."""
+    return CLIENT_STATS.snapshot()
+
+
+def get_data_status(table) -> dict:
+    """Fraîcheur des données : {"age": secondes | None, "refreshing": bool, "error": str | None}."""
+    return get_jobs_sync(table).status()
+
+
+def get_transition_log(table) -> TransitionLog | None:
+    """Journal des changements de statut du dataset de `table`."""
+    return get_jobs_sync(table).transitions
+
+
+def get_data_version(table) -> int:
+    """Version courante des données (incrémentée à chaque changement)."""
+    return get_jobs_sync(table).version
+
+
+def enqueue_job_update(table, record_id: str, updates: dict) -> None:
+    """
+    Met à jour un job en différé.
+    
+    Le cache est patché immédiatement ; l'écriture Airtable part par lot
+    après quelques secondes d'inactivité (voir WRITE_QUEUE_CONFIG).
+    """
+    sync = get_jobs_sync(table)
+    sync.queue.enqueue_updates(table, {record_id: updates})
+    sync.apply_updates({record_id: updates})
+
+
+def enqueue_job_delete(table, record_id: str) -> None:
+    """Supprime un job en différé (retiré du cache immédiatement)."""
+    sync = get_jobs_sync(table)
+    sync.queue.enqueue_deletes(table, [record_id])
+    sync.apply_deletes([record_id])
+
+
+def flush_pending_writes(table, progress: ProgressCallback | None = None) -> bool:
+    """
+    Envoie immédiatement les écritures en attente. True si tout est passé.
     
-    if not records:
-        return pd.DataFrame()
+    `progress` est appelé avec (lots envoyés, lots total) après chaque lot.
+    """
+    return get_jobs_sync(table).queue.flush(progress)
+
+
+def get_pending_writes(table) -> tuple[int, str | None]:
+    """Retourne (nombre d'écritures en attente, dernière erreur d'envoi)."""
+    queue = get_jobs_sync(table).queue
+    return queue.pending_count(), queue.last_error
+
+
+def update_job(table, record_id: str, updates: dict) -> bool:
+    """
+    Met à jour un job immédiatement.
     
-    data = [{"id": r["id"], **r["fields"]} for r in records]
-    df = pd.DataFrame(data)
+    Les écritures déjà en file partent dans le même envoi, pour qu'une
+    modification plus ancienne ne puisse pas écraser celle-ci.
     
-    # Valeurs par défaut
-    defaults = {
-        COLUMNS["statut"]: "À Analyser",
-        COLUMNS["score"]: 0,
-        COLUMNS["poste"]: "Non spécifié",
-        COLUMNS["entreprise"]: "Non spécifiée",
-        COLUMNS["description"]: "",
-        COLUMNS["cover_letter"]: "",
-        COLUMNS["url"]: "",
-        COLUMNS["location"]: "",
-        COLUMNS["contact"]: "",
-        COLUMNS["contact_mail"]: "",
-        COLUMNS["job_board"]: "",
-        COLUMNS["relance"]: "",
-        COLUMNS["date_candidature"]: None,
-        COLUMNS["date_scraping"]: None,  # ✅ Ajouté
-    }
+    Returns:
+        bool: True si la mise à jour a été envoyée, False sinon
+    """
+    enqueue_job_update(table, record_id, updates)
+    return flush_pending_writes(table)
+
+
+def update_jobs(table, updates: dict[str, dict], progress: ProgressCallback | None = None) -> bool:
+    """
+    Met à jour plusieurs jobs en un seul envoi (batch_update par lots de 10).
     
-    for col, default in defaults.items():
-        if col not in df.columns:
-            df[col] = default
+    Le cache est patché une seule fois pour tout le lot, avant l'envoi.
     
-    # Score en numérique
-    df[COLUMNS["score"]] = pd.to_numeric(df[COLUMNS["score"]], errors='coerce').fillna(0)
+    Args:
+        table: Instance Airtable table
+        updates: {record_id: {champ: valeur}}
+        progress: Appelé avec (lots envoyés, lots total) après chaque lot
     
-    return df
+    Returns:
+        bool: True si tout a été envoyé, False sinon (le reste reste en file)
+    """
+    sync = get_jobs_sync(table)
+    sync.queue.enqueue_updates(table, updates)
+    sync.apply_updates(updates)
+    return flush_pending_writes(table, progress)
 
 
-def update_job(table, record_id: str, updates: dict) -> None:
-    """Met à jour un job."""
-    table.update(record_id, updates)
-    st.cache_data.clear()
+def delete_jobs(table, record_ids: list[str], progress: ProgressCallback | None = None) -> bool:
+    """Supprime plusieurs jobs en un seul envoi (batch_delete par lots de 10)."""
+    sync = get_jobs_sync(table)
+    sync.queue.enqueue_deletes(table, record_ids)
+    sync.apply_deletes(record_ids)
+    return flush_pending_writes(table, progress)
 
 
 def delete_job(table, record_id: str) -> bool:
@@ -83,10 +249,5 @@ def delete_job(table, record_id: str) -> bool:
     Returns:
         bool: True si suppression réussie, False sinon
     """
-    try:
-        table.delete(record_id)
-        st.cache_data.clear()
-        return True  # ← Ajouter ce return !
-    except Exception as e:
-        print(f"❌ Erreur lors de la suppression: {e}")
-        return False
\ No newline at end of file
+    enqueue_job_delete(table, record_id)
+    return flush_pending_writes(table)
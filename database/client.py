@@ -0,0 +1,144 @@
+"""
+Client Airtable avec limitation de débit.
+=========================================
+Airtable autorise 5 requêtes/seconde par base. Chaque requête HTTP (y compris
+chaque page d'un `table.all()`) consomme un jeton d'un token bucket partagé
+par tout le process ; les réponses 429/5xx sont réessayées avec un backoff
+exponentiel à jitter.
+"""
+
+import random
+import re
+import threading
+import time
+
+import requests
+from pyairtable import Api
+
+from config.settings import RATE_LIMIT_CONFIG
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "PATCH", "PUT", "DELETE"}
+_BASE_ID = re.compile(r"/v0/(app\w+)")
+
+
+class TokenBucket:
+    """Token bucket thread-safe."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Prend un jeton, en attendant si besoin. Retourne le temps d'attente."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ClientStats:
+    """Compteurs d'appels Airtable, partagés par tout le process."""
+
+    FIELDS = ("requests", "throttled", "retried", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+        self._wait = 0.0
+
+    def incr(self, name: str, wait: float = 0.0) -> None:
+        with self._lock:
+            self._counts[name] += 1
+            self._wait += wait
+
+    def snapshot(self) -> dict:
+        """Copie des compteurs (+ temps total passé à attendre un jeton)."""
+        with self._lock:
+            return {**self._counts, "throttle_wait": round(self._wait, 3)}
+
+
+CLIENT_STATS = ClientStats()
+_BUCKETS: dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def get_bucket(base_id: str) -> TokenBucket:
+    """Token bucket de la base (un par base_id, pour tout le process)."""
+    with _BUCKETS_LOCK:
+        if base_id not in _BUCKETS:
+            _BUCKETS[base_id] = TokenBucket(
+                RATE_LIMIT_CONFIG["requests_per_second"], RATE_LIMIT_CONFIG["burst"]
+            )
+        return _BUCKETS[base_id]
+
+
+def backoff_delay(attempt: int, response: requests.Response | None = None) -> float:
+    """Délai avant le prochain essai : Retry-After si fourni, sinon backoff à jitter."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    ceiling = min(RATE_LIMIT_CONFIG["backoff_max"], RATE_LIMIT_CONFIG["backoff_base"] * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+class ThrottledApi(Api):
+    """
+    Api pyairtable dont chaque requête passe par le token bucket de sa base.
+
+    La stratégie de retry intégrée de pyairtable est désactivée : les retries
+    sont faits ici, pour être comptés et respecter le bucket.
+    """
+
+    def __init__(self, api_key: str, **kwargs):
+        kwargs.setdefault("retry_strategy", None)
+        super().__init__(api_key, **kwargs)
+
+    def request(self, method: str, url: str, *args, **kwargs):
+        match = _BASE_ID.search(str(url))
+        bucket = get_bucket(match.group(1) if match else "")
+        max_retries = RATE_LIMIT_CONFIG["max_retries"]
+
+        for attempt in range(max_retries + 1):
+            waited = bucket.acquire()
+            if waited:
+                CLIENT_STATS.incr("throttled", waited)
+            CLIENT_STATS.incr("requests")
+
+            try:
+                return super().request(method, url, *args, **kwargs)
+            except requests.exceptions.HTTPError as e:
+                response = e.response
+                status = response.status_code if response is not None else None
+                if attempt == max_retries or not self._retryable(method, url, status):
+                    CLIENT_STATS.incr("failed")
+                    raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                response = None
+                if attempt == max_retries or not self._retryable(method, url, None):
+                    CLIENT_STATS.incr("failed")
+                    raise
+
+            CLIENT_STATS.incr("retried")
+            time.sleep(backoff_delay(attempt, response))
+
+    @staticmethod
+    def _retryable(method: str, url: str, status: int | None) -> bool:
+        """429 toujours ; 5xx et erreurs réseau seulement si rejouer est sans risque."""
+        if status == 429:
+            return True
+        if status is not None and status not in RETRY_STATUSES:
+            return False
+        return method.upper() in IDEMPOTENT_METHODS or str(url).endswith("/listRecords")
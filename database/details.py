@@ -0,0 +1,65 @@
+"""
+Champs lourds chargés à la demande.
+===================================
+Description, cover letter et informations de suivi ne sont pas chargés avec
+la liste des jobs : ils sont récupérés record par record à l'ouverture de la
+page détail et gardés dans un cache LRU.
+"""
+
+import threading
+from collections import OrderedDict
+
+from config.settings import COLUMNS, LIST_FIELDS
+
+# Valeurs par défaut des champs de la page détail
+DETAIL_DEFAULTS = {
+    COLUMNS["description"]: "",
+    COLUMNS["cover_letter"]: "",
+    COLUMNS["url"]: "",
+    COLUMNS["contact"]: "",
+    COLUMNS["contact_mail"]: "",
+    COLUMNS["relance"]: "",
+}
+
+
+def detail_fields(fields: dict) -> dict:
+    """Ne garde que les champs hors liste."""
+    return {k: v for k, v in fields.items() if k not in LIST_FIELDS}
+
+
+class DetailsCache:
+    """Cache LRU thread-safe {record_id: champs lourds}."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, record_id: str) -> dict | None:
+        with self._lock:
+            fields = self._items.get(record_id)
+            if fields is not None:
+                self._items.move_to_end(record_id)
+            return fields
+
+    def put(self, record: dict) -> dict:
+        """Met en cache un record complet renvoyé par Airtable."""
+        fields = {**DETAIL_DEFAULTS, **detail_fields(record["fields"])}
+        with self._lock:
+            self._items[record["id"]] = fields
+            self._items.move_to_end(record["id"])
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return fields
+
+    def patch(self, updates: dict[str, dict]) -> None:
+        """Met à jour les entrées déjà en cache (les autres sont ignorées)."""
+        with self._lock:
+            for record_id, fields in updates.items():
+                if record_id in self._items:
+                    self._items[record_id] = {**self._items[record_id], **detail_fields(fields)}
+
+    def evict(self, record_ids: list[str]) -> None:
+        with self._lock:
+            for record_id in record_ids:
+                self._items.pop(record_id, None)
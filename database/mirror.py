@@ -0,0 +1,97 @@
+"""
+Miroir local de la table Jobs.
+==============================
+Copie SQLite des records Airtable, lue au démarrage pour afficher les données
+immédiatement, puis tenue à jour par le moteur de synchronisation.
+"""
+
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id TEXT PRIMARY KEY,
+    fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class JobsMirror:
+    """
+    Miroir SQLite des records Airtable.
+
+    Une connexion est ouverte par opération : le miroir peut ainsi être
+    utilisé depuis les threads de session comme depuis le thread de synchro.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def load(self) -> tuple[list[dict], dict[str, datetime]]:
+        """
+        Lit le miroir.
+
+        Returns:
+            (records, marks) : records au format Airtable et horodatages
+            de synchronisation (high_water_mark, last_sync, last_full_sync).
+        """
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute("SELECT id, fields FROM records").fetchall()
+                meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.Error as e:
+            logger.warning("Miroir illisible (%s), ignoré", e)
+            return [], {}
+
+        records = [{"id": rid, "fields": json.loads(fields)} for rid, fields in rows]
+        marks = {key: datetime.fromisoformat(value) for key, value in meta.items()}
+        return records, marks
+
+    def replace_all(self, records: list[dict], marks: dict[str, datetime]) -> None:
+        """Remplace tout le contenu du miroir (réconciliation complète)."""
+        self._write(records, marks, replace=True)
+
+    def upsert(self, records: list[dict], marks: dict[str, datetime]) -> None:
+        """Insère ou met à jour des records (delta sync)."""
+        self._write(records, marks, replace=False)
+
+    def delete(self, record_ids: list[str]) -> None:
+        """Supprime des records du miroir."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany("DELETE FROM records WHERE id = ?", [(rid,) for rid in record_ids])
+        except sqlite3.Error as e:
+            logger.warning("Échec de suppression dans le miroir: %s", e)
+
+    def _write(self, records: list[dict], marks: dict[str, datetime], replace: bool) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                if replace:
+                    conn.execute("DELETE FROM records")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO records (id, fields) VALUES (?, ?)",
+                    [(r["id"], json.dumps(r["fields"], ensure_ascii=False)) for r in records],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [(key, value.isoformat()) for key, value in marks.items() if value is not None],
+                )
+        except sqlite3.Error as e:
+            logger.warning("Échec d'écriture du miroir: %s", e)
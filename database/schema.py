@@ -0,0 +1,75 @@
+"""
+Schéma typé du DataFrame Jobs.
+==============================
+Appliqué une seule fois au chargement : catégories pour les chaînes très
+répétées, score en entier 8 bits, dates parsées avec un format fixe.
+"""
+
+import pandas as pd
+
+from config.settings import COLUMNS, DEFAULT_STATUS, PIPELINE_ORDER
+
+# Colonnes catégorielles et valeur de remplissage des cellules vides
+CATEGORY_COLUMNS = {
+    COLUMNS["statut"]: DEFAULT_STATUS,
+    COLUMNS["entreprise"]: "Non spécifiée",
+    COLUMNS["job_board"]: "",
+    COLUMNS["location"]: "",
+}
+
+DATE_COLUMNS = [COLUMNS["date_scraping"], COLUMNS["date_candidature"]]
+
+SCORE_DTYPE = "int8"
+
+
+def coerce_score(values: pd.Series) -> pd.Series:
+    """Score /10 en entier 8 bits (arrondi, borné à [0, 10])."""
+    score = pd.to_numeric(values, errors='coerce').fillna(0)
+    return score.round().clip(0, 10).astype(SCORE_DTYPE)
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Dates Airtable (ISO 8601) en datetime64 naïf UTC."""
+    return pd.to_datetime(values, format="ISO8601", errors='coerce', utc=True).dt.tz_localize(None)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applique le schéma typé (modifie et retourne `df`).
+
+    Idempotent : les colonnes déjà au bon type ne sont pas retraitées, ce
+    qui rend l'appel quasi gratuit après un patch ou une fusion.
+    """
+    if df.empty:
+        return df
+
+    for col, fill in CATEGORY_COLUMNS.items():
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            values = df[col].fillna(fill)
+            if col == COLUMNS["statut"]:
+                extra = sorted(set(values.unique()) - set(PIPELINE_ORDER))
+                df[col] = pd.Categorical(values, categories=PIPELINE_ORDER + extra)
+            else:
+                df[col] = values.astype("category")
+
+    if COLUMNS["score"] in df.columns and df[COLUMNS["score"]].dtype != SCORE_DTYPE:
+        df[COLUMNS["score"]] = coerce_score(df[COLUMNS["score"]])
+
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_dtype(df[col]):
+            df[col] = parse_dates(df[col])
+
+    return df
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """Mémoire (Ko) par colonne avant/après application du schéma."""
+    mem_before = before.memory_usage(deep=True, index=False)
+    mem_after = after.memory_usage(deep=True, index=False)
+    return {
+        "total_kb": (round(float(mem_before.sum()) / 1024, 1), round(float(mem_after.sum()) / 1024, 1)),
+        "columns_kb": {
+            col: (round(float(mem_before[col]) / 1024, 1), round(float(mem_after.get(col, 0)) / 1024, 1))
+            for col in before.columns
+        },
+    }
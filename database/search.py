@@ -0,0 +1,233 @@
+"""
+Index de recherche plein texte.
+===============================
+Index inversé en mémoire sur Poste, Entreprise, Location et Description,
+insensible aux accents et à la casse, avec mots vides français et anglais.
+
+Chaque version d'un record est un document numéroté de façon croissante :
+les listes de postings restent triées sans effort (intersection numpy), et
+un record modifié est simplement réindexé sous un nouveau numéro, l'ancien
+étant marqué mort puis purgé par compactage.
+"""
+
+import bisect
+import re
+import threading
+import unicodedata
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from config.settings import COLUMNS, SEARCH_CONFIG
+
+# Champs de liste indexés (la description arrive à part, voir add_descriptions)
+TEXT_COLUMNS = [COLUMNS["poste"], COLUMNS["entreprise"], COLUMNS["location"]]
+
+STOPWORDS = frozenset("""
+    au aux avec ce ces cet cette dans de des du elle en est et il ils la le les
+    leur leurs ne nos notre nous on ou par pas plus pour qui que sa se ses son
+    sont sur un une vos votre vous
+    an and are as at be by for from in is it its of on or our that the this to
+    we will with you your
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:\+\+|#)?")
+
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents ("Développeur Œuvre" -> "developpeur oeuvre")."""
+    text = str(text).lower()
+    if text.isascii():
+        return text
+    text = text.replace("œ", "oe").replace("æ", "ae").replace("ß", "ss")
+    # Décomposition puis retrait de tout ce qui n'est pas ASCII (accents compris) :
+    # seuls [a-z0-9] sont de toute façon indexés
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+def tokenize(text: str) -> set[str]:
+    """Tokens indexables d'un texte (mots vides et lettres isolées exclus)."""
+    return {t for t in _TOKEN.findall(normalize(text)) if len(t) > 1 and t not in STOPWORDS}
+
+
+class SearchIndex:
+    """
+    Index inversé incrémental des jobs.
+
+    `sync(df)` réindexe uniquement les records dont le texte a changé
+    (signature par ligne) ; les descriptions sont ajoutées au fil de l'eau
+    (page détail, enrichissement en arrière-plan par JobsSync).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, array] = {}
+        self._docs: list[str] = []                  # document -> record id
+        self._alive = bytearray()                   # document -> vivant (1) / mort (0)
+        self._doc_of: dict[str, int] = {}           # record id -> document vivant
+        self._list_tokens: dict[str, frozenset[str]] = {}
+        self._signatures = pd.Series(dtype="uint64")
+        self._pending_descriptions: dict[str, frozenset[str]] = {}
+        self._vocab: list[str] | None = None        # vocabulaire trié (recherche par préfixe)
+        self._version = None
+
+    # === Indexation ===
+
+    def sync(self, df: pd.DataFrame) -> None:
+        """Aligne l'index sur le DataFrame (no-op si sa version est déjà indexée)."""
+        version = df.attrs.get("data_version")
+        if version is not None and version == self._version:
+            return
+
+        with self._lock:
+            if df.empty:
+                for record_id in list(self._doc_of):
+                    self._remove(record_id)
+            else:
+                ids = df["id"]
+                signatures = pd.util.hash_pandas_object(df[TEXT_COLUMNS], index=False)
+                signatures.index = ids.to_numpy()
+                known = self._signatures.reindex(signatures.index, fill_value=0)
+                changed = np.flatnonzero(known.to_numpy() != signatures.to_numpy())
+
+                rows = df[TEXT_COLUMNS].iloc[changed]
+                texts = map(" ".join, zip(*(rows[col].astype(str).to_numpy() for col in TEXT_COLUMNS)))
+                id_values = ids.to_numpy()
+                for pos, text in zip(changed, texts):
+                    record_id = id_values[pos]
+                    tokens = frozenset(tokenize(text))
+                    self._list_tokens[record_id] = tokens
+                    # Les tokens de description de l'ancien document sont perdus : ils
+                    # reviennent au prochain enrichissement (record modifié dans Airtable)
+                    self._add(record_id, tokens | self._pending_descriptions.pop(record_id, frozenset()))
+
+                for record_id in set(self._doc_of) - set(id_values):
+                    self._remove(record_id)
+                self._signatures = signatures
+
+            self._version = version
+            self._maybe_compact()
+
+    def add_descriptions(self, records: list[dict]) -> None:
+        """Indexe la description de records Airtable (champ absent = vide)."""
+        with self._lock:
+            for record in records:
+                description = record["fields"].get(COLUMNS["description"], "")
+                self._set_description(record["id"], frozenset(tokenize(description)))
+            self._maybe_compact()
+
+    # === Requêtes ===
+
+    def search(self, query: str) -> list[str] | None:
+        """
+        Ids des records contenant tous les termes de la requête.
+
+        Le dernier terme est cherché comme préfixe (saisie en cours), sauf si
+        la requête se termine par un espace.
+
+        Returns:
+            Liste d'ids, ou None si la requête ne contient aucun terme
+        """
+        words = _TOKEN.findall(normalize(query))
+        prefix = None
+        if words and not query[-1:].isspace() and len(words[-1]) >= SEARCH_CONFIG["min_prefix"]:
+            prefix = words.pop()
+        terms = {w for w in words if len(w) > 1 and w not in STOPWORDS}
+        if not terms and prefix is None:
+            return None
+
+        with self._lock:
+            lists = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    return []
+                lists.append(self._docs_of(term))
+            if prefix is not None:
+                lists.append(self._prefix_docs(prefix))
+
+            lists.sort(key=len)
+            docs = lists[0]
+            for other in lists[1:]:
+                if not len(docs):
+                    break
+                docs = np.intersect1d(docs, other, assume_unique=True)
+
+            docs = docs[np.frombuffer(self._alive, dtype=np.bool_)[docs]]
+            return [self._docs[doc] for doc in docs]
+
+    def _prefix_docs(self, prefix: str) -> np.ndarray:
+        """Documents contenant un token commençant par `prefix`."""
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        start = bisect.bisect_left(self._vocab, prefix)
+        end = bisect.bisect_left(self._vocab, prefix + "\uffff", lo=start)
+        if start == end:
+            return np.empty(0, dtype=np.int32)
+        if end - start == 1:
+            return self._docs_of(self._vocab[start])
+        # Union par masque (évite le tri d'un np.unique sur des milliers de postings)
+        hit = np.zeros(len(self._docs), dtype=np.bool_)
+        for token in self._vocab[start:end]:
+            hit[np.frombuffer(self._postings[token], dtype=np.int32)] = True
+        return np.flatnonzero(hit).astype(np.int32)
+
+    def _docs_of(self, token: str) -> np.ndarray:
+        """Copie des postings d'un token (aucune vue ne doit survivre au verrou)."""
+        return np.frombuffer(self._postings[token], dtype=np.int32).copy()
+
+    # === Interne (appelé sous self._lock) ===
+
+    def _set_description(self, record_id: str, tokens: frozenset[str]) -> None:
+        if record_id in self._list_tokens:
+            self._add(record_id, self._list_tokens[record_id] | tokens)
+        else:
+            # Record pas encore dans le DataFrame : appliqué à son arrivée
+            self._pending_descriptions[record_id] = tokens
+
+    def _add(self, record_id: str, tokens: frozenset[str]) -> None:
+        """Indexe un record sous un nouveau document (l'ancien devient mort)."""
+        old = self._doc_of.get(record_id)
+        if old is not None:
+            self._alive[old] = 0
+        doc = len(self._docs)
+        self._docs.append(record_id)
+        self._alive.append(1)
+        self._doc_of[record_id] = doc
+        postings = self._postings
+        for token in tokens:
+            try:
+                postings[token].append(doc)
+            except KeyError:
+                postings[token] = array("i", (doc,))
+                self._vocab = None
+
+    def _remove(self, record_id: str) -> None:
+        doc = self._doc_of.pop(record_id, None)
+        if doc is not None:
+            self._alive[doc] = 0
+        self._list_tokens.pop(record_id, None)
+
+    def _maybe_compact(self) -> None:
+        """Purge les documents morts quand ils deviennent majoritaires."""
+        dead = len(self._docs) - len(self._doc_of)
+        if dead < SEARCH_CONFIG["compact_min_dead"] or dead < len(self._doc_of):
+            return
+
+        alive = np.frombuffer(self._alive, dtype=np.bool_)
+        remap = np.cumsum(alive, dtype=np.int64) - 1
+        postings = {}
+        for token, docs in self._postings.items():
+            docs = np.frombuffer(docs, dtype=np.int32)
+            docs = docs[alive[docs]]
+            if len(docs):
+                postings[token] = array("i")
+                postings[token].frombytes(remap[docs].astype(np.int32).tobytes())
+        del alive
+
+        self._postings = postings
+        self._docs = [record_id for record_id, live in zip(self._docs, self._alive) if live]
+        self._alive = bytearray(b"\x01" * len(self._docs))
+        self._doc_of = {record_id: doc for doc, record_id in enumerate(self._docs)}
+        self._vocab = None
@@ -0,0 +1,560 @@
+"""
+Moteur de synchronisation incrémentale.
+=======================================
+Garde le DataFrame des jobs en mémoire et ne récupère auprès d'Airtable que
+les records modifiés depuis le dernier high-water mark (LAST_MODIFIED_TIME).
+Une réconciliation complète périodique détecte les suppressions, et chaque
+synchronisation est répercutée dans le miroir local (database/mirror.py).
+"""
+
+import itertools
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from config.settings import COLUMNS, SYNC_CONFIG, DEFAULT_STATUS, LIST_FIELDS, DETAILS_CONFIG, SEARCH_CONFIG
+from database.details import DetailsCache
+from database.mirror import JobsMirror
+from database.schema import apply_schema, memory_report
+from database.search import SearchIndex
+from database.transitions import TransitionLog, status_changes
+from database.write_queue import WriteQueue
+
+logger = logging.getLogger(__name__)
+
+# Versions de données uniques pour tout le process
+_VERSIONS = itertools.count(1)
+
+
+# Valeurs par défaut des colonnes absentes (champs de liste uniquement)
+JOB_DEFAULTS = {
+    COLUMNS["statut"]: DEFAULT_STATUS,
+    COLUMNS["score"]: 0,
+    COLUMNS["poste"]: "Non spécifié",
+    COLUMNS["entreprise"]: "Non spécifiée",
+    COLUMNS["location"]: "",
+    COLUMNS["job_board"]: "",
+    COLUMNS["date_candidature"]: None,
+    COLUMNS["date_scraping"]: None,
+}
+
+
+def records_to_frame(records: list[dict], typed: bool = True) -> pd.DataFrame:
+    """
+    Convertit des records Airtable en DataFrame normalisé (champs de liste).
+
+    Args:
+        records: Records au format Airtable
+        typed: Applique le schéma typé (database/schema.py)
+    """
+    if not records:
+        return pd.DataFrame()
+
+    data = [
+        {"id": r["id"], **{k: v for k, v in r["fields"].items() if k in LIST_FIELDS}}
+        for r in records
+    ]
+    df = pd.DataFrame(data)
+
+    for col, default in JOB_DEFAULTS.items():
+        if col not in df.columns:
+            df[col] = default
+
+    return apply_schema(df) if typed else df
+
+
+def patch_frame(df: pd.DataFrame, updates: dict[str, dict]) -> pd.DataFrame:
+    """
+    Applique des mises à jour de champs sur une copie du DataFrame.
+
+    Args:
+        df: DataFrame courant (non modifié)
+        updates: {record_id: {champ: valeur}} ; les ids inconnus et les
+            champs hors LIST_FIELDS sont ignorés
+
+    Returns:
+        Nouveau DataFrame patché
+    """
+    if df.empty or not updates:
+        return df
+
+    positions = pd.Index(df["id"]).get_indexer(list(updates))
+    df = df.copy()
+    for fields, pos in zip(updates.values(), positions):
+        if pos < 0:
+            continue
+        for col, value in fields.items():
+            if col in LIST_FIELDS:
+                _set_cell(df, df.index[pos], col, value)
+
+    return apply_schema(df)
+
+
+def _set_cell(df: pd.DataFrame, label, col: str, value) -> None:
+    """Écrit une cellule, en élargissant le dtype de la colonne si besoin."""
+    if col not in df.columns:
+        df[col] = JOB_DEFAULTS.get(col)
+    column = df[col]
+    if isinstance(column.dtype, pd.CategoricalDtype) and isinstance(value, str):
+        if value not in column.cat.categories:
+            df[col] = column.cat.add_categories([value])
+    try:
+        df.at[label, col] = value
+    except (TypeError, ValueError):
+        numeric = pd.api.types.is_numeric_dtype(df[col]) and pd.api.types.is_number(value)
+        df[col] = df[col].astype(float if numeric else object)
+        df.at[label, col] = value
+
+
+def frame_key(df: pd.DataFrame) -> str:
+    """
+    Clé de cache d'un DataFrame.
+
+    Version de données pour un dataset servi par JobsSync (calcul gratuit),
+    hash du contenu sinon. Ne s'applique qu'au DataFrame complet : un
+    sous-ensemble filtré hérite des attrs de son parent.
+    """
+    version = df.attrs.get("data_version")
+    if version is not None:
+        return f"v{version}"
+    return f"h{pd.util.hash_pandas_object(df, index=False).sum()}"
+
+
+def build_delta_formula(since: datetime) -> str:
+    """Formule Airtable sélectionnant les records modifiés après `since` (UTC)."""
+    stamp = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{stamp}'))"
+
+
+class JobsSync:
+    """
+    État partagé du dataset Jobs.
+
+    Le DataFrame exposé est remplacé atomiquement (jamais modifié en place)
+    à chaque synchronisation : les pages doivent le considérer en lecture
+    seule. Les données, même périmées, sont servies immédiatement et
+    rafraîchies en arrière-plan (miroir local au premier accès). Les
+    écritures encore dans la file sont réappliquées par-dessus toute donnée
+    venant d'Airtable ou du miroir. Chaque changement de statut observé
+    (écriture locale ou synchro) est ajouté au journal des transitions.
+    """
+
+    def __init__(self, mirror: JobsMirror | None = None, queue: WriteQueue | None = None,
+                 transitions: TransitionLog | None = None):
+        self.mirror = mirror
+        self.queue = queue
+        self.transitions = transitions
+        self.details = DetailsCache(DETAILS_CONFIG["cache_size"])
+        self.search_index = SearchIndex()
+        if queue is not None:
+            queue.on_flushed = self._apply_flushed
+            queue.on_rejected = self._apply_rejected
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self.df = pd.DataFrame()
+        self.version = next(_VERSIONS)
+        self.high_water_mark: datetime | None = None
+        self.last_sync: datetime | None = None
+        self.last_full_sync: datetime | None = None
+        self._loaded = False
+        self._dirty = False
+        # Écritures confirmées depuis le début du fetch en cours (absentes de sa réponse)
+        self._confirmed: dict[str, dict] = {}
+        self._confirmed_deletes: set[str] = set()
+        # Valeurs d'avant les écritures locales non confirmées : annulation
+        # d'une écriture rejetée, statut de départ de la transition confirmée
+        self._originals: dict[str, dict] = {}
+        self._background: threading.Thread | None = None
+        self.last_error: str | None = None
+        self._id_index: tuple[int, pd.DataFrame, pd.Index] | None = None
+        self._enriched_at: datetime | None = None
+        self._enricher: threading.Thread | None = None
+
+    def get_data(self, table) -> pd.DataFrame:
+        """
+        Retourne le dataset immédiatement (stale-while-revalidate).
+
+        Si une synchronisation est due, elle est lancée en arrière-plan et
+        le DataFrame courant est servi tel quel ; l'appel ne bloque que s'il
+        n'y a encore aucune donnée à servir.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load_mirror()
+            if self._pending_mode() is None:
+                return self.df
+            if not self.df.empty:
+                self._start_background(table)
+                return self.df
+
+        self.refresh(table)
+        return self.df
+
+    def status(self) -> dict:
+        """État de fraîcheur : âge des données (s), refresh en cours, dernière erreur."""
+        with self._lock:
+            age = None
+            if self.last_sync is not None:
+                age = (datetime.now(timezone.utc) - self.last_sync).total_seconds()
+            refreshing = self._background is not None and self._background.is_alive()
+            return {"age": age, "refreshing": refreshing, "error": self.last_error}
+
+    def lookup(self, record_id: str) -> pd.Series | None:
+        """
+        Ligne d'un job par id, en O(1).
+
+        L'index (table de hachage sur `id`) est construit une fois par version
+        de données, au premier accès.
+        """
+        with self._lock:
+            _, df, index = self._current_index()
+
+        pos = index.get_indexer([record_id])[0]
+        return None if pos < 0 else df.iloc[pos]
+
+    def _current_index(self) -> tuple[int, pd.DataFrame, pd.Index]:
+        """(version, DataFrame, index des ids) courants ; l'appelant tient le verrou."""
+        if self._id_index is None or self._id_index[0] != self.version:
+            ids = self.df["id"] if not self.df.empty else []
+            self._id_index = (self.version, self.df, pd.Index(ids))
+        return self._id_index
+
+    def search(self, table, query: str) -> list[str] | None:
+        """
+        Ids des jobs correspondant à une requête plein texte.
+
+        L'index est aligné sur la version courante au moment de la requête
+        (seuls les records modifiés sont réindexés) ; les descriptions sont
+        indexées en arrière-plan, à partir de la première recherche.
+
+        Returns:
+            Liste d'ids, ou None si la requête est vide
+        """
+        if not query or not query.strip():
+            return None
+        self.search_index.sync(self.df)
+        self._start_enrichment(table)
+        return self.search_index.search(query)
+
+    def put_details(self, record: dict) -> dict:
+        """Met en cache les champs lourds d'un record complet et indexe sa description."""
+        self.search_index.add_descriptions([record])
+        return self.details.put(record)
+
+    def apply_updates(self, updates: dict[str, dict]) -> None:
+        """
+        Patche des champs en mémoire (écriture optimiste, non persistée).
+
+        Avec une file d'écritures, le changement de statut n'est journalisé
+        qu'une fois confirmé par Airtable (voir apply_records).
+        """
+        self.details.patch(updates)
+        with self._lock:
+            before = self.df
+            if self.queue is not None:
+                self._remember_originals(list(updates))
+            self._swap(patch_frame(self.df, updates))
+            if self.queue is None:
+                self._log_transitions(before, [i for i, fields in updates.items() if COLUMNS["statut"] in fields])
+
+    def apply_deletes(self, record_ids: list[str]) -> None:
+        """Retire des records en mémoire (suppression optimiste, non persistée)."""
+        self.details.evict(record_ids)
+        with self._lock:
+            if not self.df.empty and self.df["id"].isin(record_ids).any():
+                self._swap(self.df[~self.df["id"].isin(record_ids)].reset_index(drop=True))
+
+    def apply_records(self, records: list[dict]) -> None:
+        """Intègre des records confirmés par Airtable (retour d'une écriture)."""
+        if not records:
+            return
+        self.details.patch({r["id"]: r["fields"] for r in records})
+        with self._lock:
+            known = set(self.df["id"]) if not self.df.empty else set()
+            new = [r for r in records if r["id"] not in known]
+            df = patch_frame(self.df, {r["id"]: r["fields"] for r in records if r["id"] in known})
+            if new:
+                df = self._append(df, records_to_frame(new))
+            self._swap(self._overlaid(df))
+            self._log_confirmed(records)
+
+        if self.mirror is not None:
+            self.mirror.upsert([
+                {"id": r["id"], "fields": {k: v for k, v in r["fields"].items() if k in LIST_FIELDS}}
+                for r in records
+            ], {})
+
+    def _apply_flushed(self, updated: list[dict], deleted: list[str]) -> None:
+        """Callback de la file d'écritures : écritures confirmées par Airtable."""
+        with self._lock:
+            for r in updated:
+                fields = {k: v for k, v in r["fields"].items() if k in LIST_FIELDS}
+                self._confirmed.setdefault(r["id"], {}).update(fields)
+            for record_id in deleted:
+                self._confirmed.pop(record_id, None)
+                self._confirmed_deletes.add(record_id)
+                self._originals.pop(record_id, None)
+        self.apply_records(updated)
+        self.apply_deletes(deleted)
+        if self.mirror is not None and deleted:
+            self.mirror.delete(deleted)
+
+    def _apply_rejected(self, rejected: dict[str, int]) -> None:
+        """
+        Callback de la file d'écritures : écritures rejetées par Airtable et
+        abandonnées. Les records modifiés reprennent leurs valeurs d'avant
+        l'écriture ; ceux introuvables (404) sont retirés.
+        """
+        gone = [rid for rid, status in rejected.items() if status == 404]
+        self.details.evict(list(rejected))
+        with self._lock:
+            originals = {rid: self._originals.pop(rid) for rid in rejected if rid in self._originals}
+            reverted = {rid: fields for rid, fields in originals.items() if rid not in gone}
+            if any(rid not in reverted and rid not in gone for rid in rejected):
+                # Suppression rejetée : le record n'est plus en mémoire, seule
+                # une réconciliation complète le rétablit
+                self.last_full_sync = None
+            df = self.df
+            if gone and not df.empty:
+                df = df[~df["id"].isin(gone)].reset_index(drop=True)
+            self._swap(self._overlaid(patch_frame(df, reverted)))
+
+        if self.mirror is not None and gone:
+            self.mirror.delete(gone)
+
+    def _remember_originals(self, record_ids: list[str]) -> None:
+        """Mémorise les champs de liste des records sans écriture locale en attente."""
+        ids = [rid for rid in record_ids if rid not in self._originals]
+        if not ids or self.df.empty:
+            return
+        _, df, index = self._current_index()
+        columns = [col for col in LIST_FIELDS if col in df.columns]
+        for record_id, pos in zip(ids, index.get_indexer(ids)):
+            if pos >= 0:
+                row = df.iloc[pos]
+                self._originals[record_id] = {col: row[col] for col in columns}
+
+    def _log_confirmed(self, records: list[dict]) -> None:
+        """Journalise les changements de statut confirmés par Airtable."""
+        col = COLUMNS["statut"]
+        changes = []
+        for r in records:
+            original = self._originals.pop(r["id"], None)
+            if original is None:
+                continue
+            if col in r["fields"] and pd.notna(original.get(col)) and original[col] != r["fields"][col]:
+                changes.append((r["id"], str(original[col]), str(r["fields"][col])))
+            if self.queue is not None and self.queue.queued(r["id"]):
+                # Nouvelle écriture déjà en file : elle part de la valeur confirmée
+                confirmed = {k: v for k, v in r["fields"].items() if k in LIST_FIELDS}
+                self._originals[r["id"]] = {**original, **confirmed}
+        if self.transitions is not None:
+            self.transitions.append(changes)
+
+    def refresh(self, table) -> None:
+        """Synchronise avec Airtable si nécessaire (un seul fetch à la fois)."""
+        with self._fetch_lock:
+            with self._lock:
+                mode = self._pending_mode()
+            if mode == "full":
+                self._full_sync(table)
+            elif mode == "delta":
+                self._delta_sync(table)
+
+    def _pending_mode(self) -> str | None:
+        """Type de synchronisation à effectuer : "full", "delta" ou None."""
+        now = datetime.now(timezone.utc)
+        if (
+            self.high_water_mark is None
+            or self.last_full_sync is None
+            or (now - self.last_full_sync).total_seconds() >= SYNC_CONFIG["full_interval"]
+        ):
+            return "full"
+        if (
+            self._dirty
+            or self.last_sync is None
+            or (now - self.last_sync).total_seconds() >= SYNC_CONFIG["delta_interval"]
+        ):
+            return "delta"
+        return None
+
+    def _load_mirror(self) -> None:
+        """Charge le miroir local (démarrage à froid)."""
+        self._loaded = True
+        if self.mirror is None:
+            return
+
+        records, marks = self.mirror.load()
+        self._swap(self._overlaid(records_to_frame(records)))
+        self.high_water_mark = marks.get("high_water_mark")
+        self.last_sync = marks.get("last_sync")
+        self.last_full_sync = marks.get("last_full_sync")
+        # Données disque : on force une réconciliation avec Airtable
+        self._dirty = True
+
+    def _start_background(self, table) -> None:
+        """Lance la réconciliation en arrière-plan (une seule à la fois)."""
+        if self._background is not None and self._background.is_alive():
+            return
+        self._background = threading.Thread(
+            target=self._background_refresh, args=(table,), daemon=True
+        )
+        self._background.start()
+
+    def _background_refresh(self, table) -> None:
+        try:
+            self.refresh(table)
+        except Exception as e:
+            logger.warning("Synchronisation en arrière-plan échouée: %s", e)
+            with self._lock:
+                self.last_error = str(e)
+        else:
+            with self._lock:
+                self.last_error = None
+
+    def _start_enrichment(self, table) -> None:
+        """Lance l'indexation des descriptions si elle est due (une seule à la fois)."""
+        with self._lock:
+            if self._enricher is not None and self._enricher.is_alive():
+                return
+            if (
+                self._enriched_at is not None
+                and (datetime.now(timezone.utc) - self._enriched_at).total_seconds()
+                < SEARCH_CONFIG["description_interval"]
+            ):
+                return
+            self._enricher = threading.Thread(
+                target=self._enrich_descriptions, args=(table,), daemon=True
+            )
+            self._enricher.start()
+
+    def _enrich_descriptions(self, table) -> None:
+        """
+        Indexe les descriptions page par page : toute la table au premier
+        passage, puis seulement les records modifiés depuis le précédent.
+        """
+        mark = self._next_mark()
+        options = {"fields": [COLUMNS["description"]]}
+        if self._enriched_at is not None:
+            options["formula"] = build_delta_formula(self._enriched_at)
+        try:
+            for page in table.iterate(**options):
+                self.search_index.add_descriptions(page)
+        except Exception as e:
+            logger.warning("Indexation des descriptions échouée: %s", e)
+            return
+        self._enriched_at = mark
+
+    def _next_mark(self) -> datetime:
+        """High-water mark à enregistrer pour une synchro démarrant maintenant."""
+        margin = timedelta(seconds=SYNC_CONFIG["clock_margin"])
+        return datetime.now(timezone.utc) - margin
+
+    def _marks(self) -> dict[str, datetime]:
+        return {
+            "high_water_mark": self.high_water_mark,
+            "last_sync": self.last_sync,
+            "last_full_sync": self.last_full_sync,
+        }
+
+    def _full_sync(self, table) -> None:
+        """Recharge toute la table (détecte aussi les suppressions)."""
+        mark = self._begin_fetch()
+        records = table.all(fields=LIST_FIELDS)
+        raw = records_to_frame(records, typed=False)
+        df = apply_schema(raw.copy())
+        if not raw.empty:
+            before_kb, after_kb = memory_report(raw, df)["total_kb"]
+            logger.info("Jobs: %d lignes, %.0f Ko -> %.0f Ko après typage", len(df), before_kb, after_kb)
+
+        with self._lock:
+            before = self.df
+            self._swap(self._overlaid(df))
+            # Changements faits ailleurs (ou hors ligne, par rapport au miroir)
+            self._log_transitions(before)
+            self.high_water_mark = mark
+            self.last_sync = self.last_full_sync = datetime.now(timezone.utc)
+            self._dirty = False
+            marks = self._marks()
+            records = self._confirmed_records(records)
+
+        if self.mirror is not None:
+            self.mirror.replace_all(records, marks)
+
+    def _delta_sync(self, table) -> None:
+        """Récupère uniquement les records modifiés depuis le high-water mark."""
+        mark = self._begin_fetch()
+        records = table.all(fields=LIST_FIELDS, formula=build_delta_formula(self.high_water_mark))
+
+        with self._lock:
+            self._merge(records)
+            self.high_water_mark = mark
+            self.last_sync = datetime.now(timezone.utc)
+            self._dirty = False
+            marks = self._marks()
+            records = self._confirmed_records(records)
+
+        if self.mirror is not None:
+            self.mirror.upsert(records, marks)
+
+    def _begin_fetch(self) -> datetime:
+        """
+        Début d'un fetch : oublie les écritures confirmées avant lui (sa
+        réponse les contient) et retourne le high-water mark à enregistrer.
+        """
+        with self._lock:
+            self._confirmed, self._confirmed_deletes = {}, set()
+        return self._next_mark()
+
+    def _confirmed_records(self, records: list[dict]) -> list[dict]:
+        """Records d'un fetch corrigés des écritures confirmées pendant celui-ci."""
+        if not self._confirmed and not self._confirmed_deletes:
+            return records
+        return [
+            {**r, "fields": {**r["fields"], **self._confirmed.get(r["id"], {})}}
+            for r in records if r["id"] not in self._confirmed_deletes
+        ]
+
+    def _overlaid(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Réapplique sur des données distantes les écritures qu'elles peuvent
+        ne pas contenir : confirmées pendant le fetch, puis non confirmées.
+        """
+        if df.empty:
+            return df
+        updates, deletes = self.queue.pending() if self.queue is not None else ({}, set())
+        deletes = deletes | self._confirmed_deletes
+        if deletes:
+            df = df[~df["id"].isin(deletes)].reset_index(drop=True)
+        if self._confirmed:
+            df = patch_frame(df, self._confirmed)
+        return patch_frame(df, updates)
+
+    def _swap(self, df: pd.DataFrame) -> None:
+        """Remplace le DataFrame exposé et incrémente la version de données."""
+        self.version = next(_VERSIONS)
+        df.attrs["data_version"] = self.version
+        self.df = df
+
+    @staticmethod
+    def _append(base: pd.DataFrame, changed: pd.DataFrame) -> pd.DataFrame:
+        """Remplace/ajoute les lignes de `changed` dans `base`."""
+        if base.empty:
+            return changed
+        base = base[~base["id"].isin(changed["id"])]
+        # La concaténation de catégories différentes repasse en object
+        return apply_schema(pd.concat([base, changed], ignore_index=True))
+
+    def _merge(self, records: list[dict]) -> None:
+        """Fusionne les records modifiés dans le DataFrame courant."""
+        if records:
+            before = self.df
+            self._swap(self._overlaid(self._append(self.df, records_to_frame(records))))
+            self._log_transitions(before, [r["id"] for r in records])
+
+    def _log_transitions(self, before: pd.DataFrame, ids: list[str] | None = None) -> None:
+        """Journalise les changements de statut entre `before` et le DataFrame courant."""
+        if self.transitions is not None:
+            self.transitions.append(status_changes(before, self.df, ids))
@@ -0,0 +1,115 @@
+"""
+Journal des changements de statut.
+==================================
+Fichier JSON Lines en ajout seul : une ligne par transition
+{"id", "from", "to", "at"} (horodatage ISO UTC). Le journal n'est jamais
+réécrit ; les lecteurs le consomment de façon incrémentale à partir d'un
+offset en octets (voir analytics/transitions.py).
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from config.settings import COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def status_changes(before: pd.DataFrame, after: pd.DataFrame,
+                   ids: list[str] | None = None) -> list[tuple[str, str, str]]:
+    """
+    Changements de statut entre deux versions du DataFrame.
+
+    Args:
+        before: DataFrame avant modification
+        after: DataFrame après modification
+        ids: Records à comparer (tous si None) ; les records absents de
+            `before` (nouveaux) ne sont pas des transitions
+
+    Returns:
+        Liste de (record_id, ancien statut, nouveau statut)
+    """
+    col = COLUMNS["statut"]
+    if before.empty or after.empty or col not in before.columns or col not in after.columns:
+        return []
+    if ids is not None:
+        if not ids:
+            return []
+        # Seules les lignes concernées sont comparées (une écriture = quelques records)
+        before = before[before["id"].isin(ids)]
+        after = after[after["id"].isin(ids)]
+
+    pos = pd.Index(before["id"]).get_indexer(after["id"])
+    known = pos >= 0
+    old = before[col].to_numpy(dtype=object)[pos[known]]
+    new = after[col].to_numpy(dtype=object)[known]
+    changed = old != new
+    return [
+        (record_id, str(frm), str(to))
+        for record_id, frm, to in zip(after["id"].to_numpy()[known][changed], old[changed], new[changed])
+        if pd.notna(to)
+    ]
+
+
+class TransitionLog:
+    """
+    Journal append-only des transitions de statut.
+
+    Chaque ajout est écrit en une seule fois et suivi d'un flush : un
+    lecteur ne voit jamais qu'une dernière ligne incomplète, qu'il ignore
+    jusqu'au prochain passage.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, changes: list[tuple[str, str, str]], at: datetime | None = None) -> None:
+        """Ajoute des transitions (record_id, from, to) horodatées à `at` (maintenant par défaut)."""
+        if not changes:
+            return
+        stamp = (at or datetime.now(timezone.utc)).isoformat()
+        lines = "".join(
+            json.dumps({"id": record_id, "from": frm, "to": to, "at": stamp}, ensure_ascii=False) + "\n"
+            for record_id, frm, to in changes
+        )
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+        except OSError as e:
+            logger.warning("Journal des transitions non écrit (%s)", e)
+
+    def read_from(self, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Lit les transitions ajoutées depuis `offset`.
+
+        Returns:
+            (événements, nouvel offset) ; l'offset s'arrête après la dernière
+            ligne complète. Un offset au-delà de la fin (journal remplacé)
+            renvoie ([], -1) : le lecteur doit repartir de zéro.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, 2)
+                if f.tell() < offset:
+                    return [], -1
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return [], (0 if offset == 0 else -1)
+
+        end = chunk.rfind(b"\n") + 1
+        events = []
+        for line in chunk[:end].decode("utf-8").splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                logger.warning("Ligne illisible ignorée dans %s", self.path.name)
+        return events, offset + end
@@ -0,0 +1,252 @@
+"""
+File d'écritures différées (write-behind).
+==========================================
+Les changements de statut et suppressions sont appliqués immédiatement au
+cache local puis envoyés à Airtable par lots (batch_update / batch_delete),
+après une courte période d'inactivité ou sur demande.
+
+Un lot refusé par Airtable est renvoyé record par record : les records
+rejetés (4xx hors 429) sont abandonnés et signalés, seuls les échecs
+réessayables (réseau, 429, 5xx) sont remis en file, avec backoff.
+"""
+
+import logging
+import threading
+from typing import Callable
+
+import requests
+
+from config.settings import WRITE_QUEUE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+FlushCallback = Callable[[list[dict], list[str]], None]
+RejectCallback = Callable[[dict[str, int]], None]
+ProgressCallback = Callable[[int, int], None]
+
+
+def chunked(items: list, size: int) -> list[list]:
+    """Découpe une liste en lots de `size` éléments."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def rejection_status(error: Exception) -> int | None:
+    """Code HTTP si Airtable a rejeté la requête (4xx hors 429), None si elle est réessayable."""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if 400 <= status < 500 and status != 429:
+            return status
+    return None
+
+
+def describe_rejection(error: requests.exceptions.HTTPError) -> str:
+    """Motif court d'un rejet : code HTTP et message d'erreur Airtable."""
+    response = error.response
+    try:
+        detail = response.json().get("error")
+    except ValueError:
+        detail = None
+    message = (detail.get("message") or detail.get("type")) if isinstance(detail, dict) else detail
+    return f"{response.status_code} {message or response.reason}"
+
+
+class WriteQueue:
+    """
+    File d'écritures coalescées par record.
+
+    Plusieurs mises à jour d'un même record fusionnent en une seule ; une
+    suppression annule les mises à jour en attente du record. Les écritures
+    confirmées sont notifiées à `on_flushed`, les rejetées à `on_rejected`
+    ({record_id: code HTTP}).
+    """
+
+    def __init__(self, on_flushed: FlushCallback | None = None,
+                 on_rejected: RejectCallback | None = None):
+        self.on_flushed = on_flushed
+        self.on_rejected = on_rejected
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._updates: dict[str, dict] = {}
+        self._deletes: dict[str, None] = {}
+        self._inflight: tuple[dict[str, dict], list[str]] = ({}, [])
+        self._table = None
+        self._timer: threading.Timer | None = None
+        self._failures = 0
+        self.last_error: str | None = None
+
+    def enqueue_updates(self, table, updates: dict[str, dict]) -> None:
+        """Ajoute des mises à jour {record_id: {champ: valeur}}."""
+        with self._lock:
+            for record_id, fields in updates.items():
+                if record_id in self._deletes:
+                    continue
+                self._updates.setdefault(record_id, {}).update(fields)
+            self._table = table
+            self._schedule()
+
+    def enqueue_deletes(self, table, record_ids: list[str]) -> None:
+        """Ajoute des suppressions."""
+        with self._lock:
+            for record_id in record_ids:
+                self._updates.pop(record_id, None)
+                self._deletes[record_id] = None
+            self._table = table
+            self._schedule()
+
+    def pending(self) -> tuple[dict[str, dict], set[str]]:
+        """Copie des écritures non confirmées (en file ou en cours d'envoi)."""
+        with self._lock:
+            inflight_updates, inflight_deletes = self._inflight
+            deletes = set(inflight_deletes) | set(self._deletes)
+            updates = {rid: dict(f) for rid, f in inflight_updates.items() if rid not in deletes}
+            for record_id, fields in self._updates.items():
+                updates.setdefault(record_id, {}).update(fields)
+            return updates, deletes
+
+    def queued(self, record_id: str) -> bool:
+        """True si le record a une écriture en file (hors envoi en cours)."""
+        with self._lock:
+            return record_id in self._updates or record_id in self._deletes
+
+    def pending_count(self) -> int:
+        """Nombre de records ayant une écriture non confirmée."""
+        updates, deletes = self.pending()
+        return len(updates) + len(deletes)
+
+    def flush(self, progress: ProgressCallback | None = None) -> bool:
+        """
+        Envoie les écritures en attente par lots.
+
+        Args:
+            progress: Appelé avec (lots envoyés, lots total) après chaque lot
+
+        Returns:
+            bool: True si tout a été envoyé, False sinon (échecs réessayables
+            remis en file, records rejetés abandonnés ; voir last_error)
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._cancel_timer()
+                updates, deletes, table = self._updates, list(self._deletes), self._table
+                self._updates, self._deletes = {}, {}
+                self._inflight = (updates, deletes)
+
+            size = WRITE_QUEUE_CONFIG["batch_size"]
+            update_batches = chunked([{"id": rid, "fields": f} for rid, f in updates.items()], size)
+            delete_batches = chunked(deletes, size)
+            total = len(update_batches) + len(delete_batches)
+            updated, deleted, done = [], [], 0
+            rejected: dict[str, requests.exceptions.HTTPError] = {}
+
+            def delete(ids: list[str]) -> list[str]:
+                try:
+                    table.batch_delete(ids)
+                except requests.exceptions.HTTPError as e:
+                    # Record déjà supprimé dans Airtable : la suppression est acquise
+                    if len(ids) > 1 or rejection_status(e) != 404:
+                        raise
+                return ids
+
+            errors = []
+            try:
+                for batch in update_batches:
+                    self._send(table.batch_update, batch, updated, rejected)
+                    done += 1
+                    if progress is not None:
+                        progress(done, total)
+                for batch in delete_batches:
+                    self._send(delete, batch, deleted, rejected)
+                    done += 1
+                    if progress is not None:
+                        progress(done, total)
+            except Exception as e:
+                logger.warning("Échec d'envoi des écritures: %s", e)
+                errors.append(str(e))
+                done_ids = {r["id"] for r in updated} | set(deleted) | set(rejected)
+                self._requeue(
+                    {rid: f for rid, f in updates.items() if rid not in done_ids},
+                    [rid for rid in deletes if rid not in done_ids],
+                )
+            else:
+                with self._lock:
+                    self._failures = 0
+
+            if rejected:
+                logger.warning("Écritures rejetées par Airtable: %s", list(rejected))
+                errors.append(
+                    f"{len(rejected)} écriture(s) rejetée(s) par Airtable : "
+                    + ", ".join(f"{rid} ({describe_rejection(e)})" for rid, e in rejected.items())
+                )
+            self.last_error = " · ".join(errors) or None
+
+            with self._lock:
+                # Écritures rejetées : plus réappliquées par-dessus les données
+                self._inflight = (
+                    {rid: f for rid, f in updates.items() if rid not in rejected},
+                    [rid for rid in deletes if rid not in rejected],
+                )
+            try:
+                self._notify(updated, deleted, {rid: e.response.status_code for rid, e in rejected.items()})
+            finally:
+                with self._lock:
+                    self._inflight = ({}, [])
+            return self.last_error is None
+
+    @staticmethod
+    def _send(send, batch: list, sent: list, rejected: dict) -> None:
+        """
+        Envoie un lot ; s'il est rejeté, renvoie ses records un par un pour
+        isoler les fautifs (ajoutés à `rejected`). Les échecs réessayables
+        sont propagés.
+        """
+        try:
+            sent.extend(send(batch))
+            return
+        except Exception as e:
+            if rejection_status(e) is None:
+                raise
+            if len(batch) == 1:
+                item = batch[0]
+                rejected[item["id"] if isinstance(item, dict) else item] = e
+                return
+        for item in batch:
+            try:
+                sent.extend(send([item]))
+            except Exception as e:
+                if rejection_status(e) is None:
+                    raise
+                rejected[item["id"] if isinstance(item, dict) else item] = e
+
+    def _notify(self, updated: list[dict], deleted: list[str], rejected: dict[str, int]) -> None:
+        if self.on_flushed is not None and (updated or deleted):
+            self.on_flushed(updated, deleted)
+        if self.on_rejected is not None and rejected:
+            self.on_rejected(rejected)
+
+    def _requeue(self, updates: dict[str, dict], deletes: list[str]) -> None:
+        """Remet en file des écritures non envoyées (les plus récentes priment)."""
+        with self._lock:
+            for record_id, fields in updates.items():
+                if record_id not in self._deletes:
+                    self._updates[record_id] = {**fields, **self._updates.get(record_id, {})}
+            for record_id in deletes:
+                self._updates.pop(record_id, None)
+                self._deletes[record_id] = None
+            # Nouvel essai automatique, de plus en plus espacé
+            self._failures += 1
+            self._schedule(min(
+                WRITE_QUEUE_CONFIG["idle_delay"] * 2 ** self._failures,
+                WRITE_QUEUE_CONFIG["retry_max_delay"],
+            ))
+
+    def _schedule(self, delay: float | None = None) -> None:
+        """(Re)lance le timer de flush (après inactivité par défaut)."""
+        self._cancel_timer()
+        self._timer = threading.Timer(delay or WRITE_QUEUE_CONFIG["idle_delay"], self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
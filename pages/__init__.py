@@ -1,7 +1,23 @@
-"""Pages package."""
-from pages.dashboard import render_dashboard
-from pages.inbox import render_inbox
-from pages.job_details import render_job_details
-from pages.pipeline import render_pipeline
+"""Pages package (modules importés à la première utilisation)."""
+import importlib
 
-__all__ = ['render_dashboard', 'render_inbox', 'render_job_details', 'render_pipeline']
\ No newline at end of file
+# Fonction exportée -> module de page
+_EXPORTS = {
+    'render_dashboard': 'pages.dashboard',
+    'render_inbox': 'pages.inbox',
+    'render_job_details': 'pages.job_details',
+    'render_pipeline': 'pages.pipeline',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import paresseux des pages (PEP 562)."""
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -4,72 +4,33 @@ Page Dashboard - Dark Theme Moderne.
 Utilise Date Scraping pour les graphiques, scores affichés en /10.
 """
 
+import html
+from datetime import date
+
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-
-from config.settings import COLUMNS, STATUS_CONFIG, SCORE_THRESHOLDS, PIPELINE_ORDER
 
+from config.settings import COLUMNS, STATUS_CONFIG, SCORE_THRESHOLDS, PIPELINE_ORDER, TRANSITIONS_CONFIG
+from analytics.stats import JobsStats
+from analytics.transitions import get_stage_metrics
+from analytics.weekly import get_weekly_data
+from database.airtable import get_transition_log
+from database.sync import frame_key
+from components.templates import JOB_CARD, KPI_CARD, STAGE_CARD, STAT_CARD, STATUS_BADGE, meta_line, render_html, score_badge, truncate
 
-def get_weekly_data(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Agrège les données par semaine en utilisant la colonne Date Scraping.
-    
-    Returns:
-        DataFrame avec colonnes: week_label, count, avg_score, applied_count
-    """
-    # Convertir Date Scraping en datetime
-    df_dated = df.copy()
-    
-    if COLUMNS["date_scraping"] in df_dated.columns:
-        df_dated['_date'] = pd.to_datetime(df_dated[COLUMNS["date_scraping"]], errors='coerce')
-    else:
-        # Fallback si pas de colonne
-        df_dated['_date'] = pd.NaT
-    
-    # Créer la structure des 8 dernières semaines
-    today = datetime.now()
-    weeks_data = []
-    
-    for i in range(7, -1, -1):
-        week_start = today - timedelta(weeks=i)
-        week_start = week_start - timedelta(days=week_start.weekday())  # Lundi
-        week_end = week_start + timedelta(days=6)  # Dimanche
-        
-        # Format: "23 Déc"
-        month_names = {
-            'Jan': 'Jan', 'Feb': 'Fév', 'Mar': 'Mar', 'Apr': 'Avr',
-            'May': 'Mai', 'Jun': 'Juin', 'Jul': 'Juil', 'Aug': 'Août',
-            'Sep': 'Sep', 'Oct': 'Oct', 'Nov': 'Nov', 'Dec': 'Déc'
-        }
-        raw_label = week_start.strftime("%d %b")
-        day = raw_label.split()[0].lstrip("0")
-        month = month_names.get(raw_label.split()[1], raw_label.split()[1])
-        week_label = f"{day} {month}"
-        
-        # Filtrer les jobs de cette semaine
-        mask = (df_dated['_date'] >= week_start) & (df_dated['_date'] <= week_end)
-        week_jobs = df_dated[mask]
-        
-        weeks_data.append({
-            'week_label': week_label,
-            'count': len(week_jobs),
-            'avg_score': week_jobs[COLUMNS["score"]].mean() if len(week_jobs) > 0 else 0,
-            'applied_count': len(week_jobs[week_jobs[COLUMNS["statut"]] == "Postulé"]) if len(week_jobs) > 0 else 0
-        })
-    
-    return pd.DataFrame(weeks_data)
+# Fenêtres proposées pour les graphiques hebdomadaires (en semaines)
+WEEKLY_WINDOWS = [4, 8, 12, 26, 52]
 
 
-def create_donut_chart(df: pd.DataFrame) -> go.Figure:
+def create_donut_chart(stats: JobsStats) -> go.Figure:
     """Donut chart pour la distribution des statuts."""
     status_counts = []
     status_labels = []
     colors = []
     
     for status in PIPELINE_ORDER:
-        count = len(df[df[COLUMNS["statut"]] == status])
+        count = stats.count(status)
         if count > 0:
             status_counts.append(count)
             status_labels.append(status)
@@ -84,7 +45,7 @@ def create_donut_chart(df: pd.DataFrame) -> go.Figure:
         hovertemplate='<b>%{label}</b><br>%{value} jobs (%{percent})<extra></extra>'
     )])
     
-    total = len(df)
+    total = stats.total
     fig.update_layout(
         showlegend=True,
         legend=dict(
@@ -110,10 +71,8 @@ def create_donut_chart(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def create_weekly_score_chart(df: pd.DataFrame) -> go.Figure:
+def create_weekly_score_chart(weekly: pd.DataFrame) -> go.Figure:
     """Évolution du score moyen par semaine."""
-    weekly = get_weekly_data(df)
-    
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
@@ -160,10 +119,8 @@ def create_weekly_score_chart(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def create_weekly_jobs_chart(df: pd.DataFrame) -> go.Figure:
+def create_weekly_jobs_chart(weekly: pd.DataFrame) -> go.Figure:
     """Nombre de jobs scrappés par semaine."""
-    weekly = get_weekly_data(df)
-    
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
@@ -195,10 +152,8 @@ def create_weekly_jobs_chart(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def create_weekly_applications_chart(df: pd.DataFrame) -> go.Figure:
+def create_weekly_applications_chart(weekly: pd.DataFrame) -> go.Figure:
     """Nombre de candidatures envoyées par semaine."""
-    weekly = get_weekly_data(df)
-    
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
@@ -230,59 +185,76 @@ def create_weekly_applications_chart(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def render_kpi_card(icon: str, value, label: str, color: str):
-    """Carte KPI dark theme."""
+# Constructeurs de figures par type de graphique
+CHART_BUILDERS = {
+    "weekly_score": create_weekly_score_chart,
+    "donut": create_donut_chart,
+    "weekly_jobs": create_weekly_jobs_chart,
+    "weekly_applications": create_weekly_applications_chart,
+}
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_figure(kind: str, version: str, window: int | None, day: date | None, _source) -> go.Figure:
+    """Figure construite une seule fois par (type, version des données, fenêtre, jour)."""
+    return CHART_BUILDERS[kind](_source)
+
+
+def get_figure(kind: str, df: pd.DataFrame, source, window: int | None = None) -> go.Figure:
+    """
+    Figure Plotly mémoïsée.
+
+    Args:
+        kind: Clé de CHART_BUILDERS
+        df: DataFrame source (sa version sert de clé de cache)
+        source: Données passées au constructeur (agrégat hebdo ou stats)
+        window: Fenêtre en semaines, None si le graphique n'en dépend pas
+    """
+    # Les graphiques hebdo dépendent aussi du jour (fenêtre glissante, cf. get_weekly_data)
+    day = date.today() if window is not None else None
+    return _cached_figure(kind, frame_key(df), window, day, source)
+
+
+def format_duration(seconds: float | None) -> str:
+    """Durée lisible : "45 min", "5 h", "3,5 j" ("—" si inconnue)."""
+    if seconds is None:
+        return "—"
+    if seconds < 3600:
+        return f"{max(seconds / 60, 1):.0f} min"
+    if seconds < 86400:
+        return f"{seconds / 3600:.0f} h"
+    return f"{seconds / 86400:.1f} j".replace(".", ",")
+
+
+def render_stage_times(table) -> None:
+    """Temps passé par étape et débit récent, d'après le journal des transitions."""
+    log = get_transition_log(table)
+    if log is None:
+        return
+    metrics = get_stage_metrics(log)
+    days = TRANSITIONS_CONFIG["throughput_days"]
+
     st.markdown(f"""
-        <div style="
-            background: #1e293b;
-            border-radius: 12px;
-            padding: 1.25rem;
-            border: 1px solid #334155;
-            text-align: center;
-        ">
-            <div style="
-                width: 42px;
-                height: 42px;
-                border-radius: 10px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 1.25rem;
-                margin: 0 auto 0.75rem auto;
-                background: {color}20;
-            ">{icon}</div>
-            <div style="font-size: 1.75rem; font-weight: 700; color: #f8fafc;">{value}</div>
-            <div style="font-size: 0.75rem; color: #64748b; margin-top: 0.25rem;">{label}</div>
+        <div style="margin: 1.25rem 0 0.75rem 0;">
+            <span style="font-size: 1.1rem; font-weight: 600; color: #f8fafc;">⏱️ Temps par étape</span>
+            <span style="font-size: 0.75rem; color: #64748b; margin-left: 0.5rem;">Changements de statut journalisés · débit sur {days} j</span>
         </div>
     """, unsafe_allow_html=True)
 
-
-def get_score_badge_html(score: float) -> str:
-    """Retourne le HTML du badge score en format /10."""
-    if score >= 8:
-        bg = "rgba(74, 222, 128, 0.15)"
-        color = "#4ade80"
-    elif score >= 5:
-        bg = "rgba(251, 146, 60, 0.15)"
-        color = "#fb923c"
-    else:
-        bg = "rgba(248, 113, 113, 0.15)"
-        color = "#f87171"
-    
-    return f"""
-        <div style="
-            background: {bg};
-            color: {color};
-            padding: 0.4rem 0.6rem;
-            border-radius: 8px;
-            font-weight: 700;
-            font-size: 0.9rem;
-            text-align: center;
-        ">{score:.0f}/10</div>
-    """
+    cards = []
+    for stage in PIPELINE_ORDER:
+        m = metrics[stage]
+        cfg = STATUS_CONFIG.get(stage, {"icon": "📋", "color": "#a78bfa"})
+        open_line = f"⏳ {m.open} en cours · {format_duration(m.open_age)}" if m.open else "⏳ 0 en cours"
+        cards.append(STAGE_CARD.substitute(
+            color=cfg["color"], icon=cfg["icon"], stage=html.escape(stage),
+            dwell=format_duration(m.avg_dwell), stays=f"{m.stays} séjour(s)",
+            lines=meta_line(f"➡️ {m.throughput} sortie(s) / {days} j", "#94a3b8") + meta_line(open_line),
+        ))
+    render_html(cards, columns=len(cards))
 
 
-def render_dashboard(df: pd.DataFrame) -> None:
+def render_dashboard(df: pd.DataFrame, stats: JobsStats, table=None) -> None:
     """Dashboard principal dark theme."""
     
     # === HEADER ===
@@ -298,14 +270,12 @@ def render_dashboard(df: pd.DataFrame) -> None:
     """, unsafe_allow_html=True)
     
     # === KPIs ===
-    total = len(df)
-    to_analyze = len(df[df[COLUMNS["statut"]] == "À Analyser"])
-    to_generate = len(df[df[COLUMNS["statut"]] == "Générer LM"])
-    ready = len(df[df[COLUMNS["statut"]] == "Prêt"])
-    applied = len(df[df[COLUMNS["statut"]] == "Postulé"])
-    avg_score = df[COLUMNS["score"]].mean() if not df.empty else 0
+    total = stats.total
+    to_analyze = stats.count("À Analyser")
+    to_generate = stats.count("Générer LM")
+    ready = stats.count("Prêt")
+    applied = stats.count("Postulé")
     
-    kpi_cols = st.columns(5)
     kpis = [
         ("📁", total, "Total Scrappés", "#a78bfa"),
         ("🔍", to_analyze, "À Analyser", "#fb923c"),
@@ -313,10 +283,10 @@ def render_dashboard(df: pd.DataFrame) -> None:
         ("📤", ready, "Prêts", "#60a5fa"),
         ("✅", applied, "Postulés", "#4ade80"),
     ]
-    
-    for col, (icon, value, label, color) in zip(kpi_cols, kpis):
-        with col:
-            render_kpi_card(icon, value, label, color)
+    render_html([
+        KPI_CARD.substitute(icon=icon, value=value, label=label, color=color)
+        for icon, value, label, color in kpis
+    ], columns=5)
     
     st.markdown("<div style='height: 1.25rem;'></div>", unsafe_allow_html=True)
     
@@ -373,35 +343,40 @@ def render_dashboard(df: pd.DataFrame) -> None:
                 status_cfg = STATUS_CONFIG.get(status, {"icon": "📋", "color": "#a78bfa"})
                 
                 with st.container(border=True):
-                    c1, c2 = st.columns([4, 1])
-                    with c1:
-                        st.markdown(f"**{poste[:50]}{'...' if len(poste) > 50 else ''}**")
-                        st.caption(f"🏢 {entreprise}")
-                        if location:
-                            st.caption(f"📍 {location}")
-                    with c2:
-                        st.markdown(get_score_badge_html(score), unsafe_allow_html=True)
+                    # Contenu en lecture seule : un seul élément HTML
+                    lines = (
+                        meta_line(f"🏢 {entreprise}", "#94a3b8")
+                        + meta_line(f"📍 {location}" if location else "")
+                        + '<div style="margin-top:0.5rem;">'
+                        + STATUS_BADGE.substitute(color=status_cfg['color'], icon=status_cfg['icon'],
+                                                  status=html.escape(status))
+                        + '</div>'
+                    )
+                    render_html([JOB_CARD.substitute(
+                        title=html.escape(truncate(poste, 50)),
+                        lines=lines,
+                        badge=score_badge(score, size="0.9rem", padding="0.4rem 0.6rem"),
+                    )])
                     
-                    f1, f2 = st.columns([2, 1])
-                    with f1:
-                        st.markdown(f"""
-                            <span style="
-                                background: {status_cfg['color']}20;
-                                color: {status_cfg['color']};
-                                padding: 0.2rem 0.5rem;
-                                border-radius: 5px;
-                                font-size: 0.7rem;
-                                font-weight: 600;
-                            ">{status_cfg['icon']} {status}</span>
-                        """, unsafe_allow_html=True)
-                    with f2:
-                        if st.button("Ouvrir →", key=f"open_{job_id}", use_container_width=True):
+                    with st.container(horizontal=True, horizontal_alignment="right"):
+                        if st.button("Ouvrir →", key=f"open_{job_id}"):
                             st.session_state.selected_job_id = job_id
                             st.session_state.current_page = "details"
                             st.rerun()
     
     # --- RIGHT: Charts ---
     with col_right:
+        # Agrégation hebdo partagée par les trois graphiques
+        weeks = st.segmented_control(
+            "Période",
+            options=WEEKLY_WINDOWS,
+            default=8,
+            format_func=lambda w: f"{w} sem.",
+            key="weekly_window",
+            label_visibility="collapsed"
+        ) or 8
+        weekly = get_weekly_data(df, weeks)
+        
         # Chart 1: Score moyen
         st.markdown("""
             <div style="margin-bottom: 0.35rem;">
@@ -410,7 +385,7 @@ def render_dashboard(df: pd.DataFrame) -> None:
             </div>
         """, unsafe_allow_html=True)
         
-        fig_score = create_weekly_score_chart(df)
+        fig_score = get_figure("weekly_score", df, weekly, weeks)
         st.plotly_chart(fig_score, use_container_width=True, config={'displayModeBar': False})
         
         # Chart 2: Donut
@@ -420,7 +395,7 @@ def render_dashboard(df: pd.DataFrame) -> None:
             </div>
         """, unsafe_allow_html=True)
         
-        fig_donut = create_donut_chart(df)
+        fig_donut = get_figure("donut", df, stats)
         st.plotly_chart(fig_donut, use_container_width=True, config={'displayModeBar': False})
         
         # Two small charts
@@ -434,7 +409,7 @@ def render_dashboard(df: pd.DataFrame) -> None:
                     <span style="font-size: 0.85rem; font-weight: 600; color: #f8fafc;">📥 Jobs Scrappés</span>
                 </div>
             """, unsafe_allow_html=True)
-            fig_jobs = create_weekly_jobs_chart(df)
+            fig_jobs = get_figure("weekly_jobs", df, weekly, weeks)
             st.plotly_chart(fig_jobs, use_container_width=True, config={'displayModeBar': False})
         
         with chart_col2:
@@ -443,52 +418,20 @@ def render_dashboard(df: pd.DataFrame) -> None:
                     <span style="font-size: 0.85rem; font-weight: 600; color: #f8fafc;">✅ Candidatures</span>
                 </div>
             """, unsafe_allow_html=True)
-            fig_applied = create_weekly_applications_chart(df)
+            fig_applied = get_figure("weekly_applications", df, weekly, weeks)
             st.plotly_chart(fig_applied, use_container_width=True, config={'displayModeBar': False})
         
         # Stats row
-        stat_cols = st.columns(3)
-        
-        with stat_cols[0]:
-            st.markdown(f"""
-                <div style="
-                    background: #1e293b;
-                    border: 1px solid #334155;
-                    border-radius: 8px;
-                    text-align: center; 
-                    padding: 0.65rem;
-                ">
-                    <div style="color: #64748b; font-size: 0.65rem;">Score Moyen</div>
-                    <div style="color: #a78bfa; font-size: 1.1rem; font-weight: 700;">{avg_score:.1f}/10</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with stat_cols[1]:
-            conversion = (applied / total * 100) if total > 0 else 0
-            st.markdown(f"""
-                <div style="
-                    background: #1e293b;
-                    border: 1px solid #334155;
-                    border-radius: 8px;
-                    text-align: center; 
-                    padding: 0.65rem;
-                ">
-                    <div style="color: #64748b; font-size: 0.65rem;">Conversion</div>
-                    <div style="color: #4ade80; font-size: 1.1rem; font-weight: 700;">{conversion:.1f}%</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with stat_cols[2]:
-            hp_count = len(df[df[COLUMNS["score"]] >= 8])
-            st.markdown(f"""
-                <div style="
-                    background: #1e293b;
-                    border: 1px solid #334155;
-                    border-radius: 8px;
-                    text-align: center; 
-                    padding: 0.65rem;
-                ">
-                    <div style="color: #64748b; font-size: 0.65rem;">High Priority</div>
-                    <div style="color: #f472b6; font-size: 1.1rem; font-weight: 700;">{hp_count}</div>
-                </div>
-            """, unsafe_allow_html=True)
\ No newline at end of file
+        render_html([
+            STAT_CARD.substitute(label=label, value=value, color=color, radius="8px", padding="0.65rem",
+                                 label_size="0.65rem", value_size="1.1rem")
+            for label, value, color in [
+                ("Score Moyen", f"{stats.avg_score:.1f}/10", "#a78bfa"),
+                ("Conversion", f"{stats.conversion:.1f}%", "#4ade80"),
+                ("High Priority", stats.high_score, "#f472b6"),
+            ]
+        ], columns=3)
+    
+    # === TEMPS PAR ÉTAPE ===
+    if table is not None:
+        render_stage_times(table)
@@ -4,14 +4,48 @@ Page Inbox - Jobs à Analyser.
 Interface originale avec compteur dynamique et suppression.
 """
 
+import html
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 
-from config.settings import COLUMNS, STATUS_CONFIG
-from database.airtable import update_job, delete_job
+from config.settings import COLUMNS, STATUS_CONFIG, INBOX_CONFIG, SCORE_THRESHOLDS
+from database.airtable import (
+    load_jobs_data, enqueue_job_update, enqueue_job_delete, update_jobs, delete_jobs, search_jobs,
+)
+from database.sync import frame_key
+from analytics.facets import FacetIndex, SCORE_RANGE, get_facets
+from analytics.stats import get_stats
+from components.actions import rerun_fragment, run_with_progress
+from components.pagination import paginate, render_pagination, reset_page
+from components.templates import JOB_CARD, STAT_CARD, meta_line, render_html, score_badge, truncate
+
+PAGE_KEY = "inbox_page"
+
+# Facettes catégorielles : nom -> libellé (valeurs par défaut dans FACET_DEFAULTS)
+FACET_LABELS = {
+    "statut": "Statut",
+    "job_board": "Job board",
+    "location": "Lieu",
+}
+
+FACET_DEFAULTS = {
+    "statut": ["À Analyser"],
+    "job_board": [],
+    "location": [],
+}
+
+INBOX_MODES = ["🗂️ Cartes", "📋 Tableau"]
 
+# Colonnes affichées en mode tableau
+TABLE_COLUMNS = [
+    COLUMNS["poste"], COLUMNS["entreprise"], COLUMNS["location"],
+    COLUMNS["job_board"], COLUMNS["score"], COLUMNS["date_scraping"],
+]
 
-def render_inbox(df: pd.DataFrame, table) -> None:
+
+def render_inbox(table) -> None:
     """Page Inbox."""
     
     # Header
@@ -24,71 +58,348 @@ def render_inbox(df: pd.DataFrame, table) -> None:
         </div>
     """, unsafe_allow_html=True)
     
+    render_inbox_body(table)
+
+
+@st.fragment
+def render_inbox_body(table) -> None:
+    """
+    Stats, filtres et liste de l'Inbox.
+    
+    Fragment : les actions des cartes ne relancent que ce bloc (pas le CSS,
+    le chargement ni la sidebar). Les données sont relues à chaque exécution,
+    les arguments d'un fragment étant figés au dernier rendu complet.
+    """
+    df = load_jobs_data(table)
+    stats = get_stats(df)
+    
     # Stats row
-    total = len(df[df[COLUMNS["statut"]] == "À Analyser"])
-    high_score = len(df[(df[COLUMNS["statut"]] == "À Analyser") & (df[COLUMNS["score"]] >= 8)])
-    avg_score = df[df[COLUMNS["statut"]] == "À Analyser"][COLUMNS["score"]].mean() if total > 0 else 0
-    
-    stat_cols = st.columns(3)
-    
-    with stat_cols[0]:
-        st.markdown(f"""
-            <div style="background:#1e293b;border:1px solid #334155;border-radius:10px;padding:1rem;text-align:center;">
-                <div style="font-size:0.75rem;color:#64748b;margin-bottom:0.25rem;">À traiter</div>
-                <div style="font-size:1.75rem;font-weight:700;color:#f8fafc;">{total}</div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with stat_cols[1]:
-        st.markdown(f"""
-            <div style="background:#1e293b;border:1px solid #334155;border-radius:10px;padding:1rem;text-align:center;">
-                <div style="font-size:0.75rem;color:#64748b;margin-bottom:0.25rem;">Score \geq 8</div>
-                <div style="font-size:1.75rem;font-weight:700;color:#4ade80;">{high_score}</div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with stat_cols[2]:
-        st.markdown(f"""
-            <div style="background:#1e293b;border:1px solid #334155;border-radius:10px;padding:1rem;text-align:center;">
-                <div style="font-size:0.75rem;color:#64748b;margin-bottom:0.25rem;">Score moyen</div>
-                <div style="font-size:1.75rem;font-weight:700;color:#a78bfa;">{avg_score:.1f}</div>
-            </div>
-        """, unsafe_allow_html=True)
+    total = stats.count("À Analyser")
+    high_score = stats.count_in("À Analyser", "high")
+    avg_score = stats.avg_score_by_status.get("À Analyser", 0)
+    
+    render_html([
+        STAT_CARD.substitute(label=label, value=value, color=color, radius="10px", padding="1rem",
+                             label_size="0.75rem", value_size="1.75rem")
+        for label, value, color in [
+            ("À traiter", total, "#f8fafc"),
+            ("Score ≥ 8", high_score, "#4ade80"),
+            ("Score moyen", f"{avg_score:.1f}", "#a78bfa"),
+        ]
+    ], columns=3)
     
     st.markdown("<div style='height:1rem;'></div>", unsafe_allow_html=True)
     
-    # Filtre par score
-    min_score = st.slider(
-        "Filtrer par score minimum",
-        min_value=0,
-        max_value=10,
-        value=0,
-        step=1,
-        key="score_filter"
+    # Mode d'affichage
+    mode = st.segmented_control(
+        "Affichage",
+        options=INBOX_MODES,
+        default=INBOX_MODES[0],
+        key="inbox_mode",
+        label_visibility="collapsed"
+    ) or INBOX_MODES[0]
+    table_mode = mode == INBOX_MODES[1]
+    
+    # Recherche plein texte
+    query = st.text_input(
+        "Rechercher",
+        placeholder="🔎 Poste, entreprise, lieu, mot-clé…",
+        key="inbox_search",
+        on_change=reset_page,
+        args=(PAGE_KEY,),
+        label_visibility="collapsed"
     )
+    matches = search_jobs(table, query)
+    within = None
+    if matches is not None:
+        within = np.sort(pd.Index(df["id"]).get_indexer(matches))
+        within = within[within >= 0]
+    
+    # Filtres à facettes (intersection des index précalculés)
+    facets = get_facets(df)
+    selection = render_facet_filters(facets, within)
+    rows = facets.select(selection, within=within)
+    filtered_df = df if rows is None else df.iloc[rows]
+    filtered_df = filtered_df.sort_values(COLUMNS["score"], ascending=False)
+    active_filters = count_active_filters(selection)
+    
+    inbox_df = df[df[COLUMNS["statut"]] == "À Analyser"]
     
-    # Filtrer les jobs : À Analyser + score >= min_score
-    filtered_df = df[
-        (df[COLUMNS["statut"]] == "À Analyser") & 
-        (df[COLUMNS["score"]] >= min_score)
-    ].sort_values(COLUMNS["score"], ascending=False)
+    # Tri en masse (sur tout l'Inbox, indépendamment du filtre)
+    render_bulk_triage(inbox_df, table)
+    render_bulk_delete_confirm(table)
     
     filtered_count = len(filtered_df)
     
+    # Page courante (bornée : la liste peut rétrécir après une suppression)
+    page_size = st.session_state.get("inbox_page_size", INBOX_CONFIG["page_size"])
+    page, start, end = paginate(filtered_count, st.session_state.get(PAGE_KEY, 0), page_size)
+    st.session_state[PAGE_KEY] = page
+    
     # Compteur dynamique
     st.markdown(f"""
         <div style="color:#64748b;font-size:0.85rem;margin:0.75rem 0 1rem 0;">
-            <strong style="color:#f8fafc;">{filtered_count}</strong> job(s) affiché(s)
-            {f'<span style="color:#a78bfa;margin-left:0.5rem;">(score \geq {min_score})</span>' if min_score > 0 else ''}
+            <strong style="color:#f8fafc;">{filtered_count}</strong> job(s)
+            {f'<span style="color:#a78bfa;margin-left:0.5rem;">({active_filters} filtre(s))</span>' if active_filters else ''}
+            {f'<span style="color:#a78bfa;margin-left:0.5rem;">« {html.escape(query)} »</span>' if matches is not None else ''}
+            {f'<span style="margin-left:0.5rem;">· {start + 1}–{end} affichés</span>' if filtered_count > page_size and not table_mode else ''}
         </div>
     """, unsafe_allow_html=True)
     
-    # Liste des jobs
+    # Liste des jobs (page courante uniquement)
     if filtered_df.empty:
         st.info("Aucun job ne correspond aux filtres")
+    elif table_mode:
+        # Clé liée à la version des données et au filtre : la sélection
+        # (positions de lignes) ne survit pas à un changement de contenu
+        render_job_table(filtered_df, table, key=f"inbox_table_{frame_key(df)}_{selection}_{query}")
     else:
-        for _, job in filtered_df.iterrows():
+        for _, job in filtered_df.iloc[start:end].iterrows():
             render_job_card(job, table)
+        
+        render_pagination(filtered_count, PAGE_KEY, page_size)
+        st.selectbox(
+            "Jobs par page",
+            options=INBOX_CONFIG["page_size_options"],
+            index=INBOX_CONFIG["page_size_options"].index(INBOX_CONFIG["page_size"]),
+            key="inbox_page_size",
+            on_change=reset_page,
+            args=(PAGE_KEY,)
+        )
+
+
+def count_active_filters(selection: dict) -> int:
+    """Nombre de facettes modifiées par rapport aux filtres par défaut."""
+    changed = sum(1 for name, default in FACET_DEFAULTS.items() if sorted(selection[name]) != sorted(default))
+    return changed + (tuple(selection["score"]) != SCORE_RANGE) + bool(selection["date"])
+
+
+def reset_facets() -> None:
+    """Rétablit les filtres par défaut."""
+    for name, default in FACET_DEFAULTS.items():
+        st.session_state[f"facet_{name}"] = list(default)
+    st.session_state["facet_score"] = SCORE_RANGE
+    st.session_state.pop("facet_date", None)
+    reset_page(PAGE_KEY)
+
+
+def render_facet_filters(facets: FacetIndex, within: np.ndarray | None) -> dict:
+    """
+    Filtres à facettes avec compteurs en direct.
+    
+    La sélection est lue dans session_state avant le rendu : chaque
+    compteur reflète les autres facettes (et la recherche) déjà appliquées.
+    
+    Returns:
+        Sélection courante, à passer à FacetIndex.select
+    """
+    for name, default in FACET_DEFAULTS.items():
+        st.session_state.setdefault(f"facet_{name}", list(default))
+    st.session_state.setdefault("facet_score", SCORE_RANGE)
+    
+    bounds = facets.date_bounds
+    dates = st.session_state.get("facet_date")
+    selection = {name: st.session_state[f"facet_{name}"] for name in FACET_DEFAULTS}
+    selection["score"] = tuple(st.session_state["facet_score"])
+    # Plage complète (ou en cours de saisie) = pas de filtre : garde les jobs sans date
+    selection["date"] = tuple(dates) if bounds and dates and len(dates) == 2 and tuple(dates) != bounds else ()
+    
+    with st.expander("🎛️ Filtres", expanded=False):
+        cols = st.columns(len(FACET_LABELS))
+        for col, (name, label) in zip(cols, FACET_LABELS.items()):
+            counts = facets.counts(name, selection, within=within)
+            key = f"facet_{name}"
+            # Valeurs sélectionnées conservées même si absentes de cette version
+            options = list(dict.fromkeys(facets.options(name) + st.session_state[key]))
+            with col:
+                st.multiselect(
+                    label,
+                    options=options,
+                    key=key,
+                    format_func=lambda value, counts=counts: f"{value or '—'} ({counts.get(value, 0)})",
+                    on_change=reset_page,
+                    args=(PAGE_KEY,),
+                    placeholder="Tous"
+                )
+        
+        col_score, col_date, col_reset = st.columns([2, 2, 1])
+        with col_score:
+            score_counts = facets.counts("score", selection, within=within)
+            low, high = selection["score"]
+            in_range = sum(n for score, n in score_counts.items() if low <= score <= high)
+            st.slider(
+                "Score",
+                min_value=SCORE_RANGE[0],
+                max_value=SCORE_RANGE[1],
+                step=1,
+                key="facet_score",
+                on_change=reset_page,
+                args=(PAGE_KEY,),
+                help=f"{in_range} job(s) dans cette plage"
+            )
+        with col_date:
+            if bounds:
+                st.date_input(
+                    "Date de scraping",
+                    value=bounds,
+                    key="facet_date",
+                    format="DD/MM/YYYY",
+                    on_change=reset_page,
+                    args=(PAGE_KEY,)
+                )
+        with col_reset:
+            st.markdown("<div style='height:1.75rem;'></div>", unsafe_allow_html=True)
+            st.button("Réinitialiser", key="facet_reset", on_click=reset_facets, use_container_width=True)
+    
+    return selection
+
+
+def render_bulk_triage(inbox_df: pd.DataFrame, table) -> None:
+    """Actions de tri en masse sur les jobs À Analyser."""
+    
+    with st.expander("⚡ Tri en masse"):
+        col_score, col_board = st.columns(2)
+        
+        # Suppression sous un score
+        with col_score:
+            max_score = st.number_input(
+                "Supprimer les jobs avec un score inférieur à",
+                min_value=1,
+                max_value=10,
+                value=SCORE_THRESHOLDS["medium"],
+                key="bulk_max_score"
+            )
+            low_ids = inbox_df.loc[inbox_df[COLUMNS["score"]] < max_score, "id"].tolist()
+            if st.button(f"🗑️ Supprimer {len(low_ids)} job(s)", key="bulk_low_delete",
+                         disabled=not low_ids, use_container_width=True):
+                st.session_state.confirm_bulk_delete = low_ids
+                rerun_fragment()
+        
+        # Refus de tout un job board
+        with col_board:
+            boards = inbox_df[COLUMNS["job_board"]].value_counts()
+            boards = boards[(boards > 0) & (boards.index != "")]
+            board = st.selectbox(
+                "Marquer comme Refus tous les jobs de",
+                options=boards.index.tolist(),
+                format_func=lambda b: f"{b} ({boards[b]})",
+                key="bulk_board"
+            )
+            if st.button("🚫 Marquer Refus", key="bulk_board_refuse",
+                         disabled=board is None, use_container_width=True):
+                board_ids = inbox_df.loc[inbox_df[COLUMNS["job_board"]] == board, "id"].tolist()
+                if run_with_progress(update_jobs, table,
+                                     {job_id: {COLUMNS["statut"]: "Refus"} for job_id in board_ids},
+                                     f"🚫 {board} → Refus"):
+                    st.toast(f"✅ {len(board_ids)} job(s) de {board} → Refus")
+                rerun_fragment()
+
+
+def render_bulk_delete_confirm(table) -> None:
+    """Confirmation d'une suppression groupée (ids fixés au moment du clic)."""
+    
+    to_delete = st.session_state.get("confirm_bulk_delete")
+    if not to_delete:
+        return
+    
+    st.error(f"⚠️ **Supprimer définitivement {len(to_delete)} offre(s) ?**")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("🗑️ Oui, supprimer", key="bulk_delete_yes", type="primary"):
+            if run_with_progress(delete_jobs, table, to_delete, "🗑️ Suppression"):
+                st.toast(f"✅ {len(to_delete)} job(s) supprimé(s)")
+            del st.session_state.confirm_bulk_delete
+            rerun_fragment()
+    
+    with col2:
+        if st.button("↩️ Annuler", key="bulk_delete_no"):
+            del st.session_state.confirm_bulk_delete
+            rerun_fragment()
+
+
+def render_job_table(jobs: pd.DataFrame, table, key: str) -> None:
+    """Mode tableau : une seule grille, sélection multiple et actions groupées."""
+    
+    event = st.dataframe(
+        jobs[TABLE_COLUMNS],
+        hide_index=True,
+        use_container_width=True,
+        height=520,
+        on_select="rerun",
+        selection_mode="multi-row",
+        key=key,
+        column_config={
+            COLUMNS["score"]: st.column_config.NumberColumn("Score", format="%d/10"),
+            COLUMNS["date_scraping"]: st.column_config.DateColumn("Scrappé le", format="DD/MM/YYYY"),
+        }
+    )
+    
+    selected_ids = jobs["id"].iloc[event.selection.rows].tolist()
+    if not selected_ids:
+        st.caption("Sélectionnez des lignes pour les traiter en masse")
+        return
+    
+    st.markdown(f"""
+        <div style="color:#64748b;font-size:0.85rem;margin:0.5rem 0;">
+            <strong style="color:#f8fafc;">{len(selected_ids)}</strong> job(s) sélectionné(s)
+        </div>
+    """, unsafe_allow_html=True)
+    
+    col_status, col_apply, col_open, col_delete = st.columns([2, 1, 1, 1])
+    
+    with col_status:
+        new_status = st.selectbox(
+            "Nouveau statut",
+            options=["À Analyser", "Générer LM", "Prêt", "Postulé", "Refus"],
+            key="bulk_status",
+            label_visibility="collapsed"
+        )
+    
+    with col_apply:
+        if st.button("✅ Appliquer", key="bulk_apply", use_container_width=True):
+            if run_with_progress(update_jobs, table,
+                                 {job_id: {COLUMNS["statut"]: new_status} for job_id in selected_ids},
+                                 f"✅ → {new_status}"):
+                st.toast(f"✅ {len(selected_ids)} job(s) → {new_status}")
+            rerun_fragment()
+    
+    with col_open:
+        if st.button("👁 Ouvrir", key="bulk_open", use_container_width=True,
+                     disabled=len(selected_ids) != 1):
+            st.session_state.selected_job_id = selected_ids[0]
+            st.session_state.current_page = "details"
+            st.rerun()
+    
+    with col_delete:
+        if st.button("❌ Supprimer", key="bulk_delete", use_container_width=True):
+            st.session_state.confirm_bulk_delete = selected_ids
+            rerun_fragment()
+
+
+# === Actions des cartes ===
+# Callbacks exécutés avant le rerun : un clic dans le fragment de l'Inbox ne
+# relance que ce fragment, sans appel explicite à st.rerun().
+
+def set_flag(key: str, value: bool) -> None:
+    """Ouvre (True) ou ferme (False) un panneau d'action de carte."""
+    if value:
+        st.session_state[key] = True
+    else:
+        st.session_state.pop(key, None)
+
+
+def save_status(table, job_id: str) -> None:
+    """Applique le statut choisi dans le panneau d'édition."""
+    enqueue_job_update(table, job_id, {COLUMNS["statut"]: st.session_state[f"status_{job_id}"]})
+    st.session_state.pop(f"editing_{job_id}", None)
+
+
+def confirm_delete(table, job_id: str) -> None:
+    """Supprime le job après confirmation."""
+    enqueue_job_delete(table, job_id)
+    st.session_state.pop(f"confirm_del_{job_id}", None)
 
 
 def render_job_card(job: pd.Series, table) -> None:
@@ -101,76 +412,32 @@ def render_job_card(job: pd.Series, table) -> None:
     location = str(job[COLUMNS["location"]]) if pd.notna(job[COLUMNS["location"]]) else ""
     source = str(job.get(COLUMNS.get("source", "source"), "")) if "source" in COLUMNS else ""
     
-    # Style du score
-    if score >= 8:
-        score_bg, score_color = "rgba(74,222,128,0.15)", "#4ade80"
-    elif score >= 5:
-        score_bg, score_color = "rgba(251,146,60,0.15)", "#fb923c"
-    else:
-        score_bg, score_color = "rgba(248,113,113,0.15)", "#f87171"
-    
     with st.container(border=True):
-        # Layout principal
-        col_content, col_actions = st.columns([5, 1])
-        
-        with col_content:
-            # Titre du poste
-            st.markdown(f"""
-                <div style="font-size:0.95rem;font-weight:600;color:#f8fafc;margin-bottom:0.4rem;">
-                    {poste[:70]}{'...' if len(poste) > 70 else ''}
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Source
-            if source:
-                st.markdown(f"""
-                    <div style="font-size:0.8rem;color:#94a3b8;margin-bottom:0.25rem;">
-                        {source}
-                    </div>
-                """, unsafe_allow_html=True)
-            
-            # Location
-            if location:
-                st.markdown(f"""
-                    <div style="font-size:0.8rem;color:#64748b;">
-                        📍 {location}
-                    </div>
-                """, unsafe_allow_html=True)
+        # Contenu en lecture seule : un seul élément HTML
+        lines = meta_line(source, "#94a3b8") + meta_line(f"📍 {location}" if location else "")
+        render_html([JOB_CARD.substitute(title=html.escape(truncate(poste, 70)), lines=lines,
+                                         badge=score_badge(score))])
         
-        with col_actions:
-            # Score badge
-            st.markdown(f"""
-                <div style="background:{score_bg};color:{score_color};padding:0.35rem 0.6rem;border-radius:8px;font-size:0.85rem;font-weight:700;text-align:center;margin-bottom:0.5rem;">
-                    {score:.0f}/10
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Boutons d'action
-            btn_cols = st.columns(3)
-            
-            with btn_cols[0]:
-                if st.button("👁", key=f"view_{job_id}", help="Voir"):
-                    st.session_state.selected_job_id = job_id
-                    st.session_state.current_page = "details"
-                    st.rerun()
+        # Boutons d'action
+        with st.container(horizontal=True, horizontal_alignment="right"):
+            if st.button("👁", key=f"view_{job_id}", help="Voir"):
+                st.session_state.selected_job_id = job_id
+                st.session_state.current_page = "details"
+                st.rerun()
             
-            with btn_cols[1]:
-                if st.button("✏️", key=f"edit_{job_id}", help="Éditer statut"):
-                    st.session_state[f"edit_{job_id}"] = True
-                    st.rerun()
+            st.button("✏️", key=f"edit_{job_id}", help="Éditer statut",
+                      on_click=set_flag, args=(f"editing_{job_id}", True))
             
-            with btn_cols[2]:
-                if st.button("❌", key=f"del_{job_id}", help="Supprimer"):
-                    st.session_state[f"confirm_del_{job_id}"] = True
-                    st.rerun()
+            st.button("❌", key=f"del_{job_id}", help="Supprimer",
+                      on_click=set_flag, args=(f"confirm_del_{job_id}", True))
         
         # Modal édition statut
-        if st.session_state.get(f"edit_{job_id}", False):
+        if st.session_state.get(f"editing_{job_id}", False):
             st.markdown("---")
             col1, col2, col3 = st.columns([2, 1, 1])
             
             with col1:
-                new_status = st.selectbox(
+                st.selectbox(
                     "Nouveau statut",
                     options=["À Analyser", "Générer LM", "Prêt", "Postulé"],
                     key=f"status_{job_id}",
@@ -178,15 +445,12 @@ def render_job_card(job: pd.Series, table) -> None:
                 )
             
             with col2:
-                if st.button("✅ Valider", key=f"save_{job_id}"):
-                    update_job(table, job_id, {COLUMNS["statut"]: new_status})
-                    del st.session_state[f"edit_{job_id}"]
-                    st.rerun()
+                st.button("✅ Valider", key=f"save_{job_id}",
+                          on_click=save_status, args=(table, job_id))
             
             with col3:
-                if st.button("↩️ Annuler", key=f"cancel_{job_id}"):
-                    del st.session_state[f"edit_{job_id}"]
-                    st.rerun()
+                st.button("↩️ Annuler", key=f"cancel_{job_id}",
+                          on_click=set_flag, args=(f"editing_{job_id}", False))
         
         # Modal confirmation suppression
         if st.session_state.get(f"confirm_del_{job_id}", False):
@@ -196,15 +460,9 @@ def render_job_card(job: pd.Series, table) -> None:
             col1, col2 = st.columns(2)
             
             with col1:
-                if st.button("🗑️ Oui, supprimer", key=f"yes_{job_id}", type="primary"):
-                    try:
-                        delete_job(table, job_id)
-                        del st.session_state[f"confirm_del_{job_id}"]
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Erreur: {e}")
+                st.button("🗑️ Oui, supprimer", key=f"yes_{job_id}", type="primary",
+                          on_click=confirm_delete, args=(table, job_id))
             
             with col2:
-                if st.button("↩️ Annuler", key=f"no_{job_id}"):
-                    del st.session_state[f"confirm_del_{job_id}"]
-                    st.rerun()
\ No newline at end of file
+                st.button("↩️ Annuler", key=f"no_{job_id}",
+                          on_click=set_flag, args=(f"confirm_del_{job_id}", False))
\ No newline at end of file
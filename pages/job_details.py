@@ -5,14 +5,13 @@ Description, cover letter éditable et actions.
 """
 
 import streamlit as st
-import pandas as pd
 
 from config.settings import COLUMNS, STATUS_CONFIG
 from components.cards import get_score_class
-from database.airtable import update_job, delete_job
+from database.airtable import update_job, delete_job, get_job, get_pending_writes, load_job_details
 
 
-def render_job_details(df: pd.DataFrame, table, job_id: str) -> None:
+def render_job_details(table, job_id: str) -> None:
     """
     Affiche la page détaillée d'un job.
     
@@ -20,16 +19,19 @@ def render_job_details(df: pd.DataFrame, table, job_id: str) -> None:
     - Gauche: Infos entreprise + description (read-only)
     - Droite: Cover letter (éditable) + statut + actions
     """
-    job = df[df['id'] == job_id]
+    job = get_job(table, job_id)
+    # Champs lourds (description, cover letter...) chargés à la demande ;
+    # None si le job a été supprimé dans Airtable depuis la dernière synchro
+    details = load_job_details(table, job_id) if job is not None else None
     
-    if job.empty:
+    if details is None:
         st.error("❌ Job introuvable")
         if st.button("← Retour à l'Inbox"):
             st.session_state.current_page = "inbox"
             st.rerun()
         return
     
-    job = job.iloc[0]
+    job = job.to_dict() | details
     
     # === Header ===
     col_back, col_title = st.columns([1, 5])
@@ -157,18 +159,22 @@ def render_job_details(df: pd.DataFrame, table, job_id: str) -> None:
                     COLUMNS["contact"]: new_contact,
                     COLUMNS["relance"]: new_relance,
                 }
-                update_job(table, job['id'], updates)
-                st.success("✅ Sauvegardé!")
-                st.rerun()
+                if update_job(table, job['id'], updates):
+                    st.success("✅ Sauvegardé!")
+                    st.rerun()
+                else:
+                    st.error(f"❌ Échec de la sauvegarde : {get_pending_writes(table)[1]}")
         
         with btn2:
             if st.button("📤 Marquer Prêt", use_container_width=True):
-                update_job(table, job['id'], {
+                if update_job(table, job['id'], {
                     COLUMNS["cover_letter"]: new_letter,
-                    COLUMNS["statut"]: "Pret"
-                })
-                st.success("✅ Prêt!")
-                st.rerun()
+                    COLUMNS["statut"]: "Prêt"
+                }):
+                    st.success("✅ Prêt!")
+                    st.rerun()
+                else:
+                    st.error(f"❌ Échec de la sauvegarde : {get_pending_writes(table)[1]}")
         
         with btn3:
             if st.button("🗑 Supprimer", use_container_width=True):
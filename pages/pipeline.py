@@ -4,26 +4,42 @@ Page Pipeline - Vue Kanban.
 4 colonnes : À Analyser, Générer LM, Prêt, Postulé
 """
 
+import html
+
 import streamlit as st
 import pandas as pd
 
-from config.settings import COLUMNS, STATUS_CONFIG
-from database.airtable import update_job
+from config.settings import COLUMNS, STATUS_CONFIG, PIPELINE_CONFIG
+from database.airtable import load_jobs_data, enqueue_job_update, update_jobs, search_jobs
+from analytics.stats import get_stats
+from components.actions import rerun_fragment, run_with_progress
+from components.kanban_board import render_kanban_board
+from components.templates import ICON_STAT_CARD, KANBAN_CARD, meta_line, render_html, score_badge, truncate
 
 # 4 colonnes seulement (sans Refus)
 KANBAN_COLUMNS = ["À Analyser", "Générer LM", "Prêt", "Postulé"]
 
+PIPELINE_MODES = ["🗂️ Cartes", "✋ Glisser-déposer"]
+
+
+def limit_key(status: str) -> str:
+    """Clé session du nombre de cartes affichées dans une colonne."""
+    return f"pipeline_limit_{status}"
+
 
-def get_score_style(score: float) -> tuple[str, str]:
-    """Retourne (background, color) pour le score."""
-    if score >= 8:
-        return "rgba(74, 222, 128, 0.15)", "#4ade80"
-    elif score >= 5:
-        return "rgba(251, 146, 60, 0.15)", "#fb923c"
-    return "rgba(248, 113, 113, 0.15)", "#f87171"
+def show_more(status: str) -> None:
+    """Étend la fenêtre d'une colonne."""
+    key = limit_key(status)
+    st.session_state[key] = st.session_state.get(key, PIPELINE_CONFIG["column_size"]) + PIPELINE_CONFIG["show_more_step"]
 
 
-def render_pipeline(df: pd.DataFrame, table) -> None:
+def reset_limits() -> None:
+    """Revient aux fenêtres initiales (à appeler quand la recherche change)."""
+    for status in KANBAN_COLUMNS:
+        st.session_state.pop(limit_key(status), None)
+
+
+def render_pipeline(table) -> None:
     """Page Pipeline principale."""
     
     # Header
@@ -38,39 +54,73 @@ def render_pipeline(df: pd.DataFrame, table) -> None:
         </div>
     """, unsafe_allow_html=True)
     
-    # Stats (4 colonnes alignées avec kanban)
-    total = len(df)
-    in_progress = len(df[~df[COLUMNS["statut"]].isin(["Postulé", "Refus"])])
-    applied = len(df[df[COLUMNS["statut"]] == "Postulé"])
-    conversion = (applied / total * 100) if total > 0 else 0
+    render_board(table)
+
+
+@st.fragment
+def render_board(table) -> None:
+    """
+    Stats et colonnes Kanban.
+    
+    Fragment : un déplacement (callback des flèches) touche deux colonnes et
+    les compteurs, le tableau entier est donc relancé, sans le CSS, le
+    chargement ni la sidebar.
+    """
+    df = load_jobs_data(table)
+    stats = get_stats(df)
     
-    stat_cols = st.columns(4)
-    stats = [
-        ("📊", total, "Total", "#a78bfa"),
-        ("⏳", in_progress, "En cours", "#60a5fa"),
-        ("✅", applied, "Postulés", "#4ade80"),
-        ("📈", f"{conversion:.0f}%", "Conversion", "#f472b6"),
+    # Stats (4 colonnes alignées avec kanban, un seul élément)
+    stat_cards = [
+        ("📊", stats.total, "Total", "#a78bfa"),
+        ("⏳", stats.in_progress, "En cours", "#60a5fa"),
+        ("✅", stats.count("Postulé"), "Postulés", "#4ade80"),
+        ("📈", f"{stats.conversion:.0f}%", "Conversion", "#f472b6"),
     ]
-    
-    for col, (icon, value, label, color) in zip(stat_cols, stats):
-        with col:
-            st.markdown(f"""
-                <div style="background:#1e293b;border:1px solid #334155;border-radius:10px;padding:1rem;text-align:center;">
-                    <div style="font-size:1.5rem;">{icon}</div>
-                    <div style="font-size:1.5rem;font-weight:700;color:{color};">{value}</div>
-                    <div style="font-size:0.75rem;color:#64748b;">{label}</div>
-                </div>
-            """, unsafe_allow_html=True)
+    render_html([
+        ICON_STAT_CARD.substitute(icon=icon, value=value, label=label, color=color)
+        for icon, value, label, color in stat_cards
+    ], columns=4)
     
     st.markdown("<div style='height:1rem;'></div>", unsafe_allow_html=True)
     
+    # Recherche plein texte (compteurs des colonnes = résultats)
+    query = st.text_input(
+        "Rechercher",
+        placeholder="🔎 Poste, entreprise, lieu, mot-clé…",
+        key="pipeline_search",
+        on_change=reset_limits,
+        label_visibility="collapsed"
+    )
+    matches = search_jobs(table, query)
+    if matches is not None:
+        df = df[df["id"].isin(matches)]
+    
+    # Mode d'affichage
+    mode = st.segmented_control(
+        "Affichage",
+        options=PIPELINE_MODES,
+        default=PIPELINE_MODES[0],
+        key="pipeline_mode",
+        label_visibility="collapsed"
+    ) or PIPELINE_MODES[0]
+    
+    # Colonnes : compteur exact, top-K par score (seules ces cartes sont rendues)
+    columns = {}
+    for status in KANBAN_COLUMNS:
+        status_jobs = df[df[COLUMNS["statut"]] == status]
+        count = stats.count(status) if matches is None else len(status_jobs)
+        limit = st.session_state.get(limit_key(status), PIPELINE_CONFIG["column_size"])
+        columns[status] = (count, status_jobs.nlargest(limit, COLUMNS["score"]), len(status_jobs))
+    
+    if mode == PIPELINE_MODES[1]:
+        render_drag_board(columns, table)
+        return
+    
     # Kanban (4 colonnes)
     kanban_cols = st.columns(4)
     
-    for col_idx, status in enumerate(KANBAN_COLUMNS):
+    for col_idx, (status, (count, top_jobs, total)) in enumerate(columns.items()):
         cfg = STATUS_CONFIG.get(status, {"icon": "📋", "color": "#6B7280"})
-        status_jobs = df[df[COLUMNS["statut"]] == status].sort_values(COLUMNS["score"], ascending=False)
-        count = len(status_jobs)
         
         with kanban_cols[col_idx]:
             # Header
@@ -85,13 +135,50 @@ def render_pipeline(df: pd.DataFrame, table) -> None:
             """, unsafe_allow_html=True)
             
             # Cards
-            if status_jobs.empty:
+            if top_jobs.empty:
                 st.markdown("""
                     <div style="background:rgba(30,41,59,0.4);border:1px dashed #334155;border-radius:8px;padding:2rem 0.75rem;text-align:center;color:#64748b;font-size:0.85rem;">Aucun job</div>
                 """, unsafe_allow_html=True)
             else:
-                for _, job in status_jobs.iterrows():
+                for _, job in top_jobs.iterrows():
                     render_job_card(job, col_idx, table)
+                
+                render_show_more(status, total - len(top_jobs), col_idx)
+
+
+def render_show_more(status: str, remaining: int, col_idx: int) -> None:
+    """Bouton "Afficher plus" d'une colonne (rien si tout est affiché)."""
+    if remaining > 0:
+        st.button(f"Afficher plus ({remaining} restant(s))", key=f"more_{col_idx}",
+                  on_click=show_more, args=(status,), use_container_width=True)
+
+
+def render_drag_board(columns: dict, table) -> None:
+    """
+    Kanban glisser-déposer : les déplacements restent côté navigateur
+    jusqu'à "Appliquer", puis partent en un seul update_jobs (cache patché
+    une fois, batch_update par lots de 10).
+    """
+    board_key = f"pipeline_board_{st.session_state.get('pipeline_board_gen', 0)}"
+    moves = render_kanban_board(
+        {status: count for status, (count, _, _) in columns.items()},
+        pd.concat([top_jobs for _, top_jobs, _ in columns.values()]),
+        key=board_key,
+    )
+    
+    # Fenêtres des colonnes, alignées sous le plateau
+    for col_idx, (col, (status, (_, top_jobs, total))) in enumerate(zip(st.columns(4), columns.items())):
+        with col:
+            render_show_more(status, total - len(top_jobs), col_idx)
+    
+    if moves:
+        if run_with_progress(update_jobs, table,
+                             {job_id: {COLUMNS["statut"]: status} for job_id, status in moves.items()},
+                             "🚚 Déplacement"):
+            st.toast(f"✅ {len(moves)} job(s) déplacé(s)")
+        # Nouveau plateau : repart des données patchées, sans déplacement en attente
+        st.session_state["pipeline_board_gen"] = st.session_state.get("pipeline_board_gen", 0) + 1
+        rerun_fragment()
 
 
 def render_job_card(job: pd.Series, col_idx: int, table):
@@ -102,45 +189,31 @@ def render_job_card(job: pd.Series, col_idx: int, table):
     poste = str(job[COLUMNS["poste"]])
     location = str(job[COLUMNS["location"]]) if pd.notna(job[COLUMNS["location"]]) else ""
     
-    score_bg, score_color = get_score_style(score)
-    poste_short = poste[:35] + "..." if len(poste) > 35 else poste
-    loc_short = location[:28] + "..." if len(location) > 28 else location
+    poste_short = truncate(poste, 35)
+    loc_short = truncate(location, 28)
     
     with st.container(border=True):
-        # Entreprise + Score
-        st.markdown(f"""
-            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:0.5rem;">
-                <span style="font-size:0.75rem;font-weight:600;color:#94a3b8;text-transform:uppercase;letter-spacing:0.3px;">{entreprise}</span>
-                <span style="background:{score_bg};color:{score_color};padding:0.25rem 0.5rem;border-radius:6px;font-size:0.8rem;font-weight:700;">{score:.0f}/10</span>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Titre
-        st.markdown(f"""
-            <div style="font-size:0.9rem;font-weight:500;color:#f8fafc;line-height:1.35;margin-bottom:0.4rem;">{poste_short}</div>
-        """, unsafe_allow_html=True)
-        
-        # Location
-        if loc_short:
-            st.caption(f"📍 {loc_short}")
+        # Entreprise + score, titre, lieu : un seul élément HTML
+        render_html([KANBAN_CARD.substitute(
+            entreprise=html.escape(entreprise),
+            badge=score_badge(score, size="0.8rem", padding="0.25rem 0.5rem", radius="6px"),
+            poste=html.escape(poste_short),
+            location=meta_line(f"📍 {loc_short}" if loc_short else ""),
+        )])
         
         # Boutons
-        b1, b2, b3 = st.columns(3)
-        
-        with b1:
+        with st.container(horizontal=True):
             if col_idx > 0:
-                if st.button("←", key=f"p_{job_id}", use_container_width=True):
-                    update_job(table, job_id, {COLUMNS["statut"]: KANBAN_COLUMNS[col_idx - 1]})
-                    st.rerun()
-        
-        with b2:
+                st.button("←", key=f"p_{job_id}", use_container_width=True,
+                          on_click=enqueue_job_update,
+                          args=(table, job_id, {COLUMNS["statut"]: KANBAN_COLUMNS[col_idx - 1]}))
+            
             if st.button("👁", key=f"v_{job_id}", use_container_width=True):
                 st.session_state.selected_job_id = job_id
                 st.session_state.current_page = "details"
                 st.rerun()
-        
-        with b3:
+            
             if col_idx < len(KANBAN_COLUMNS) - 1:
-                if st.button("→", key=f"n_{job_id}", use_container_width=True):
-                    update_job(table, job_id, {COLUMNS["statut"]: KANBAN_COLUMNS[col_idx + 1]})
-                    st.rerun()
\ No newline at end of file
+                st.button("→", key=f"n_{job_id}", use_container_width=True,
+                          on_click=enqueue_job_update,
+                          args=(table, job_id, {COLUMNS["statut"]: KANBAN_COLUMNS[col_idx + 1]}))